@@ -1,29 +1,46 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_caching import Cache
-from scrapers.leetcode_scraper import LeetCodeScraper
-from scrapers.codeforces_scraper import CodeforcesScraper
+from scrapers.http_cache import get_shared_cache
 from services.scraper_service import ScraperService
+from services.scrape_jobs import ScrapeJobRunner
+from services.problem_query import (
+    QueryError, attach_duplicates, export_problems, query_problems, search_problems, tag_counts,
+    top_solved
+)
+from services.response_cache import ResponseCache, changed_platforms
+from services.catalogue import CatalogueHolder, ProblemCatalogue, recommend_problems
+import logging
 import os
+import time
 from dotenv import load_dotenv
-import sqlite3
+from sqlalchemy import inspect
 from datetime import datetime
 from functools import wraps
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from models import Problem, db
-from utils.url_parser import extract_problem_identifier
+from models import Problem, ProblemDetail, ProblemStat, configure_sqlite, db, sqlite_engine_options, upgrade_schema
+from utils.logging_config import configure_logging
+from utils.metrics import REQUEST_LATENCY, registry as metrics_registry
+from utils.url_parser import extract_problem_identifier, format_problem_key, make_problem_key
 
 # Load environment variables
 load_dotenv()
 
+# Log through a background thread, at LOG_LEVEL and to LOG_FILE if set
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 CORS(app)
 
 # Get API key from environment
 INTERNAL_API_KEY = os.getenv('INTERNAL_API_KEY')
 
+# Maximum number of URLs accepted by /search/batch
+MAX_BATCH_SEARCH_URLS = 1000
+
 def require_api_key(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -43,14 +60,22 @@ os.makedirs(app.instance_path, exist_ok=True)
 db_path = os.path.join(app.instance_path, 'dsa_problems.db')
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = sqlite_engine_options()
 
-# Configure caching
-app.config['CACHE_TYPE'] = 'simple'  # Use simple in-memory cache
-app.config['CACHE_DEFAULT_TIMEOUT'] = 300  # Cache timeout in seconds (5 minutes)
+# Configure caching. The filesystem backend is shared by every worker and
+# survives restarts; CACHE_TYPE selects any other Flask-Caching backend
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'FileSystemCache')
+app.config['CACHE_DIR'] = os.getenv('CACHE_DIR', os.path.join(app.instance_path, 'response_cache'))
+app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '300'))  # Cache timeout in seconds (5 minutes)
+app.config['CACHE_THRESHOLD'] = int(os.getenv('CACHE_THRESHOLD', '2000'))
 
 # Initialize extensions
 db.init_app(app)
+with app.app_context():
+    # WAL, synchronous=NORMAL, mmap and cache size on every connection
+    configure_sqlite(db.engine)
 cache = Cache(app)
+response_cache = ResponseCache(cache)
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
@@ -62,37 +87,75 @@ def init_db():
     with app.app_context():
         # Check if database already exists
         if os.path.exists(db_path):
-            print("\nDatabase already exists at:", db_path)
-            print(f"Current size: {os.path.getsize(db_path)} bytes")
+            logger.info("Database already exists at %s (%d bytes)", db_path, os.path.getsize(db_path))
+            
+            # Apply schema changes added since the database was created
+            upgrade_schema(db)
             return
         
-        print("\nInitializing database...")
-        print(f"Database path: {db_path}")
+        logger.info("Initializing database at %s", db_path)
         
-        # Create all tables
-        db.create_all()
+        # Create all tables, plus the title search tables create_all doesn't know about
+        upgrade_schema(db)
         
         # Verify database creation
         if os.path.exists(db_path):
-            print("Database created successfully")
-            print(f"Database size: {os.path.getsize(db_path)} bytes")
+            logger.info("Database created successfully (%d bytes)", os.path.getsize(db_path))
         else:
-            print("Error: Database file not created")
-        
-        print("Database initialization complete\n")
+            logger.error("Database file not created")
 
-# Initialize scrapers
-leetcode_scraper = LeetCodeScraper()
-codeforces_scraper = CodeforcesScraper()
+# Initialize scraper service with every registered scraper
+scraper_service = ScraperService()
 
-# Initialize scraper service
-scraper_service = ScraperService(
-    leetcode_scraper,
-    codeforces_scraper
+# In-memory catalogue for /recommend, versioned by the all-platform cache
+# generation so every worker rebuilds after a scrape committed anywhere
+catalogue = CatalogueHolder(
+    loader=lambda generation: ProblemCatalogue.build(db, Problem, generation),
+    version=response_cache.generation
 )
 
+def on_job_complete(results):
+    """
+    Invalidate the cached responses of platforms a background job changed,
+    then re-render their most requested pages so readers after a refresh
+    don't all fall through to the database at once. The recommendation
+    catalogue is rebuilt and swapped in as well.
+    """
+    platforms = changed_platforms(results)
+    if not platforms:
+        return
+    
+    scopes = response_cache.invalidate(platforms)
+    catalogue.rebuild()
+    pages = [('/problems', ()), ('/tags', ())]
+    for platform in platforms:
+        pages.append((f'/problems/{platform}', ()))
+        pages.append(('/tags', (('platform', platform),)))
+    pages.extend((path, tuple(query)) for path, query in response_cache.hot_requests(scopes))
+    pages = list(dict.fromkeys(pages))
+    
+    for path, query in pages:
+        warm_cached_page(path, query)
+    logger.info("Invalidated cached responses for %s and warmed %d pages", ', '.join(platforms), len(pages))
+
+def warm_cached_page(path, query):
+    """Render a cached page without a client request so it lands in the cache"""
+    try:
+        with app.test_request_context(path, query_string=list(query)):
+            app.view_functions[request.url_rule.endpoint](**request.view_args)
+    except Exception as e:
+        logger.error("Error warming %s: %s", path, e)
+
+# Initialize background scrape job runner
+scrape_jobs = ScrapeJobRunner(app, scraper_service, db, Problem, on_complete=on_job_complete)
+
 def get_db_stats():
-    """Get database statistics and information"""
+    """
+    Get database statistics and information.
+
+    Problem counts come from the problem_stats table the scraper service
+    keeps up to date, so this doesn't scan the problem table.
+    """
     stats = {}
     
     # Get database size
@@ -100,43 +163,61 @@ def get_db_stats():
         stats['size_bytes'] = os.path.getsize(db_path)
         stats['size_mb'] = round(stats['size_bytes'] / (1024 * 1024), 2)
     
-    # Get total number of problems
-    stats['total_problems'] = Problem.query.count()
+    # Get problems by platform, including registered platforms with no rows
+    # yet, and by difficulty from the precomputed counts
+    problems_by_platform = {platform: 0 for platform in scraper_service.scrapers}
+    problems_by_difficulty = {}
+    for platform, difficulty, count in db.session.query(
+        ProblemStat.platform, ProblemStat.difficulty, ProblemStat.count
+    ):
+        problems_by_platform[platform] = problems_by_platform.get(platform, 0) + count
+        if difficulty:
+            problems_by_difficulty[difficulty] = problems_by_difficulty.get(difficulty, 0) + count
     
-    # Get problems by platform
-    platforms = ['leetcode', 'codeforces']
-    problems_by_platform = {}
-    for platform in platforms:
-        count = Problem.query.filter_by(platform=platform).count()
-        problems_by_platform[platform] = count
+    stats['total_problems'] = sum(problems_by_platform.values())
     stats['problems_by_platform'] = problems_by_platform
-    
-    # Get problems by difficulty
-    difficulties = Problem.query.with_entities(Problem.difficulty, db.func.count(Problem.id)).group_by(Problem.difficulty).all()
-    stats['problems_by_difficulty'] = {diff: count for diff, count in difficulties if diff}
+    stats['problems_by_difficulty'] = {
+        difficulty: count for difficulty, count in problems_by_difficulty.items() if count
+    }
     
     # Get database last modified time
     if os.path.exists(db_path):
         stats['last_modified'] = datetime.fromtimestamp(os.path.getmtime(db_path)).isoformat()
     
     # Get database schema info
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Get table info
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    stats['tables'] = [table[0] for table in tables]
-    
-    # Get Problem table columns
-    cursor.execute("PRAGMA table_info(problem);")
-    columns = cursor.fetchall()
-    stats['problem_table_columns'] = [col[1] for col in columns]
-    
-    conn.close()
+    stats.update(get_schema_info())
     
     return stats
 
+_schema_info = None
+
+def get_schema_info():
+    """
+    Get table names and Problem columns, read once per process since the
+    schema only changes when upgrade_schema runs at startup.
+    """
+    global _schema_info
+    if _schema_info is None:
+        inspector = inspect(db.engine)
+        _schema_info = {
+            'tables': inspector.get_table_names(),
+            'problem_table_columns': [column['name'] for column in inspector.get_columns('problem')]
+        }
+    return dict(_schema_info)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    """Observe the request's latency, labelled by route pattern rather than path to bound the series"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - started, request.method, endpoint, response.status_code)
+    return response
+
 # Routes
 @app.route('/')
 def index():
@@ -163,12 +244,25 @@ def health_check():
     
     return jsonify(health_status)
 
+@app.route('/metrics', methods=['GET'])
+@limiter.exempt
+def metrics():
+    """
+    Expose request latency and background job stage timings in the
+    Prometheus text format. Metrics are kept per process, so each worker
+    is scraped separately.
+    """
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/db-info', methods=['GET'])
 @require_api_key
 def get_db_info():
     """Get database statistics and information"""
     try:
         stats = get_db_stats()
+        http_cache = get_shared_cache()
+        if http_cache:
+            stats['http_cache'] = http_cache.stats()
         return jsonify({
             'status': 'success',
             'data': stats
@@ -179,49 +273,184 @@ def get_db_info():
             'message': str(e)
         }), 500
 
+def problems_cache_key(platform=None):
+    """Cache key of a problem page, scoped to the platform it lists"""
+    return response_cache.make_key(request, platform)
+
+def platform_filter_cache_key():
+    """Cache key of a response scoped by its platform query argument"""
+    return response_cache.make_key(request, request.args.get('platform'))
+
 @app.route('/problems', methods=['GET'])
-@cache.cached(timeout=300)  # Cache for 5 minutes
+@cache.cached(timeout=300, make_cache_key=problems_cache_key)  # Cache for 5 minutes
 def get_problems():
-    """Get all problems from the database"""
+    """
+    Get a page of problems from the database.
+
+    Query parameters: cursor, limit, fields, difficulty, min_rating,
+    max_rating, tag (repeatable) and min_solved.
+    """
+    return problems_page_response()
+
+@app.route('/problems/export', methods=['GET'])
+@require_api_key
+def export_all_problems():
+    """
+    Stream the full problem set as NDJSON (default) or CSV.
+
+    Query parameters: format (ndjson or csv), platform, fields and the
+    /problems filters.
+    """
+    try:
+        mimetype, chunks = export_problems(Problem, request.args, platform=request.args.get('platform'))
+    except QueryError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    
+    extension = 'csv' if mimetype == 'text/csv' else 'ndjson'
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=problems.{extension}'}
+    )
+
+@app.route('/problems/top', methods=['GET'])
+@cache.cached(timeout=300, make_cache_key=platform_filter_cache_key)  # Cache for 5 minutes
+def get_top_solved_problems():
+    """
+    Get the most solved problems in a rating band.
+
+    Query parameters: min_rating, max_rating, limit (default 10, max 100),
+    platform and fields.
+    """
+    try:
+        result = top_solved(Problem, request.args, platform=request.args.get('platform'))
+        return jsonify({
+            'status': 'success',
+            **result
+        })
+    except QueryError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/problems/search', methods=['GET'])
+@cache.cached(timeout=300, make_cache_key=platform_filter_cache_key)  # Cache for 5 minutes
+def search_problem_titles():
+    """
+    Search problems by title, matching partial words and tolerating typos.
+
+    Query parameters: q, limit (default 20, max 100), platform and fields.
+    """
     try:
-        problems = Problem.query.all()
+        result = search_problems(Problem, request.args, platform=request.args.get('platform'))
         return jsonify({
             'status': 'success',
-            'count': len(problems),
-            'problems': [{
-                'id': p.id,
-                'title': p.title,
-                'platform': p.platform,
-                'difficulty': p.difficulty,
-                'url': p.url,
-                'points': p.points,
-                'tags': p.tags.split(',') if p.tags else []
-            } for p in problems]
+            **result
         })
+    except QueryError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/recommend', methods=['GET'])
+def recommend():
+    """
+    Recommend problems from the in-memory catalogue, without querying the
+    database.
+
+    Query parameters: min_rating, max_rating, tag (repeatable), platform,
+    exclude (comma-separated problem ids, e.g. solved ones), count
+    (default 10, max 100), sort (random or solved) and seed.
+    """
+    try:
+        result = recommend_problems(catalogue.get(), request.args)
+        return jsonify({
+            'status': 'success',
+            **result
+        })
+    except QueryError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+@app.route('/problems/<int:problem_id>/details', methods=['GET'])
+def get_problem_details(problem_id):
+    """Get a problem together with its enriched statement"""
+    problem = Problem.query.get(problem_id)
+    if not problem:
+        return jsonify({
+            'status': 'error',
+            'message': 'Problem not found'
+        }), 404
+    
+    detail = ProblemDetail.query.get(problem_id)
+    return jsonify({
+        'status': 'success',
+        'problem': attach_duplicates([problem.to_dict()])[0],
+        'details': detail.to_dict() if detail else None
+    })
+
 @app.route('/problems/<platform>', methods=['GET'])
-@cache.cached(timeout=300)  # Cache for 5 minutes
+@cache.cached(timeout=300, make_cache_key=problems_cache_key)  # Cache for 5 minutes
 def get_problems_by_platform(platform):
-    """Get problems by platform"""
+    """Get a page of problems by platform, with the same parameters as /problems"""
+    return problems_page_response(platform)
+
+def problems_page_response(platform=None):
+    """Run a paginated problem query and wrap it in the API response format"""
+    try:
+        page = query_problems(Problem, request.args, platform=platform)
+        return jsonify({
+            'status': 'success',
+            **page
+        })
+    except QueryError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/tags', methods=['GET'])
+@cache.cached(timeout=300, make_cache_key=platform_filter_cache_key)  # Cache for 5 minutes
+def get_tags():
+    """
+    Get all tags with the number of problems carrying each.
+
+    Query parameters: platform (optional). Combine tags with
+    /problems?tag=a&tag=b to list problems carrying all of them.
+    """
     try:
-        problems = Problem.query.filter_by(platform=platform).all()
+        tags = tag_counts(db, Problem, platform=request.args.get('platform'))
         return jsonify({
             'status': 'success',
-            'count': len(problems),
-            'problems': [{
-                'id': p.id,
-                'title': p.title,
-                'platform': p.platform,
-                'difficulty': p.difficulty,
-                'url': p.url,
-                'points': p.points,
-                'tags': p.tags.split(',') if p.tags else []
-            } for p in problems]
+            'count': len(tags),
+            'tags': tags
         })
     except Exception as e:
         return jsonify({
@@ -232,37 +461,107 @@ def get_problems_by_platform(platform):
 @app.route('/scrape', methods=['POST'])
 @require_api_key
 def scrape_problems():
-    """Trigger scraping of problems from all platforms"""
+    """
+    Trigger scraping of problems from all platforms.
+
+    The scrape runs in the background; poll GET /scrape/<job_id> for
+    progress. A trigger while a scrape is running joins that job.
+    """
     try:
-        # Clear cache before scraping
-        cache.clear()
-        
-        # Scrape problems
-        results = scraper_service.scrape_all_platforms(db, Problem)
-        
-        # Prepare response
-        response = {
+        job, created = scrape_jobs.submit()
+        return jsonify({
             'status': 'success',
-            'message': 'Scraping completed successfully',
-            'results': {}
-        }
-        
-        # Add results for each platform
-        for platform, result in results.items():
-            response['results'][platform] = {
-                'total': result.get('total', 0),
-                'new': result.get('new', 0),
-                'updated': result.get('updated', 0),
-                'errors': result.get('errors', [])
-            }
-        
-        return jsonify(response)
+            'message': 'Scraping started' if created else 'Scraping already in progress',
+            'job_id': job.id,
+            'status_url': f'/scrape/{job.id}'
+        }), 202
     except Exception as e:
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+@app.route('/enrich', methods=['POST'])
+@require_api_key
+def enrich_problems():
+    """
+    Trigger background enrichment of problem statements and tags.
+
+    Optional body:
+    - platform: Only enrich this platform
+    - limit: Maximum number of problems to enrich per platform
+
+    Problems already enriched are skipped, so repeated runs resume where
+    the last one stopped. Poll GET /enrich/<job_id> for progress.
+    """
+    data = request.get_json(silent=True) or {}
+    options = {}
+    if data.get('platform'):
+        options['platform'] = data['platform']
+    if data.get('limit') is not None:
+        if not isinstance(data['limit'], int) or data['limit'] < 1:
+            return jsonify({
+                'status': 'error',
+                'message': 'limit must be a positive integer'
+            }), 400
+        options['limit'] = data['limit']
+    
+    try:
+        job, created = scrape_jobs.submit('enrich', **options)
+        return jsonify({
+            'status': 'success',
+            'message': 'Enrichment started' if created else 'Enrichment already in progress',
+            'job_id': job.id,
+            'status_url': f'/enrich/{job.id}'
+        }), 202
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/duplicates', methods=['POST'])
+@require_api_key
+def link_duplicate_problems():
+    """
+    Trigger a background job linking near-duplicate problems across platforms.
+
+    Titles of every platform are compared without comparing all pairs, and
+    the matches are listed under "duplicates" on problem responses. Poll
+    GET /duplicates/<job_id> for progress.
+    """
+    try:
+        job, created = scrape_jobs.submit('duplicates')
+        return jsonify({
+            'status': 'success',
+            'message': 'Duplicate linking started' if created else 'Duplicate linking already in progress',
+            'job_id': job.id,
+            'status_url': f'/duplicates/{job.id}'
+        }), 202
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/scrape/<job_id>', methods=['GET'])
+@app.route('/enrich/<job_id>', methods=['GET'])
+@app.route('/duplicates/<job_id>', methods=['GET'])
+@require_api_key
+def get_scrape_job(job_id):
+    """Get progress and results of a scrape, enrichment or duplicate linking job"""
+    job = scrape_jobs.get(job_id)
+    if not job:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'status': 'success',
+        'job': job.to_dict()
+    })
+
 @app.route('/search', methods=['POST'])
 @limiter.limit("60 per minute")
 def search_problem():
@@ -284,10 +583,8 @@ def search_problem():
         return jsonify({'error': 'URL is required'}), 400
 
     url = data['url']
-    print(f"Received URL: {url}")
-    
     platform, identifier = extract_problem_identifier(url)
-    print(f"Extracted platform: {platform}, identifier: {identifier}")
+    logger.debug("Extracted platform %s, identifier %s from %s", platform, identifier, url)
 
     if not platform or not identifier:
         return jsonify({
@@ -295,42 +592,65 @@ def search_problem():
             'details': f'URL: {url}, Platform: {platform}, Identifier: {identifier}'
         }), 400
 
-    # Search for the problem in the database
-    if platform == 'leetcode':
-        # For LeetCode, we can search by the problem slug in the URL
-        problem = Problem.query.filter_by(
-            platform='leetcode',
-            url=url
-        ).first()
-        print(f"LeetCode search result: {problem}")
-    elif platform == 'codeforces':
-        # For Codeforces, we need to match the exact problem identifier
-        # The identifier is in format "contest_number/problem_letter" (e.g., "4/A")
-        contest_number, problem_letter = identifier.split('/')
-        # Construct the exact URL pattern we're looking for
-        exact_url = f"https://codeforces.com/problemset/problem/{contest_number}/{problem_letter}"
-        problem = Problem.query.filter_by(
-            platform='codeforces',
-            url=exact_url
-        ).first()
-        print(f"Codeforces search result: {problem}")
-    else:
-        return jsonify({'error': 'Unsupported platform'}), 400
+    # Search for the problem by its canonical key (single indexed lookup)
+    problem = Problem.query.filter_by(problem_key=format_problem_key(platform, identifier)).first()
+    logger.debug("Search result: %s", problem)
 
     if not problem:
         return jsonify({'error': 'Problem not found in database'}), 404
 
     return jsonify({
         'status': 'success',
-        'problem': {
-            'id': problem.id,
-            'title': problem.title,
-            'platform': problem.platform,
-            'difficulty': problem.difficulty,
-            'url': problem.url,
-            'points': problem.points,
-            'tags': problem.tags
+        'problem': attach_duplicates([problem.to_dict()])[0]
+    })
+
+@app.route('/search/batch', methods=['POST'])
+@limiter.limit("60 per minute")
+@require_api_key
+def search_problems_batch():
+    """
+    Search for many problems by URL in one request.
+    Required headers:
+    - X-API-Key: Your API key
+    Required body:
+    - urls: List of problem URLs to search for (at most MAX_BATCH_SEARCH_URLS)
+    """
+    data = request.get_json(silent=True)
+    urls = data.get('urls') if isinstance(data, dict) else None
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': 'A non-empty list of URLs is required'}), 400
+    if len(urls) > MAX_BATCH_SEARCH_URLS:
+        return jsonify({'error': f'At most {MAX_BATCH_SEARCH_URLS} URLs are allowed per batch'}), 400
+
+    keys = [make_problem_key(url) if isinstance(url, str) else None for url in urls]
+
+    # Resolve every key with a single IN (...) query
+    found = {}
+    unique_keys = list({key for key in keys if key})
+    if unique_keys:
+        found = {
+            problem.problem_key: problem
+            for problem in Problem.query.filter(Problem.problem_key.in_(unique_keys))
         }
+
+    serialized = {key: problem.to_dict() for key, problem in found.items()}
+    attach_duplicates(list(serialized.values()))
+
+    results = []
+    for url, key in zip(urls, keys):
+        if not key:
+            results.append({'url': url, 'found': False, 'error': 'Invalid or unsupported URL format'})
+        elif key not in found:
+            results.append({'url': url, 'found': False, 'error': 'Problem not found in database'})
+        else:
+            results.append({'url': url, 'found': True, 'problem': serialized[key]})
+
+    hits = sum(1 for result in results if result['found'])
+    return jsonify({
+        'status': 'success',
+        'hits': hits,
+        'misses': len(results) - hits,
+        'results': results
     })
 
 if __name__ == '__main__':
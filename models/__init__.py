@@ -1,3 +1,19 @@
 from .problem import Problem, db
+from .tag import Tag, problem_tags, get_tag_ids, set_problem_tags
+from .problem_detail import ProblemDetail
+from .problem_stat import ProblemStat, apply_problem_stat_deltas, rebuild_problem_stats
+from .problem_link import ProblemLink, get_problem_links, replace_problem_links
+from .migrations import upgrade_schema
+from .sqlite_profile import configure_sqlite, sqlite_engine_options
+from .title_search import (
+    create_title_search, index_problem_titles, match_title_words, match_titles, title_words
+)
 
-__all__ = ['Problem', 'db'] 
\ No newline at end of file
+__all__ = [
+    'Problem', 'ProblemDetail', 'ProblemLink', 'ProblemStat', 'Tag', 'db',
+    'problem_tags', 'apply_problem_stat_deltas', 'configure_sqlite',
+    'create_title_search', 'get_problem_links', 'get_tag_ids',
+    'index_problem_titles', 'match_title_words', 'match_titles',
+    'rebuild_problem_stats', 'replace_problem_links', 'set_problem_tags',
+    'sqlite_engine_options', 'title_words', 'upgrade_schema'
+]
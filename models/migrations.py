@@ -0,0 +1,126 @@
+import logging
+from sqlalchemy import inspect, text
+from .problem import Problem
+from .problem_stat import ProblemStat, rebuild_problem_stats
+from .tag import problem_tags, set_problem_tags
+from .title_search import create_title_search
+from utils.url_parser import make_problem_key
+
+logger = logging.getLogger(__name__)
+
+def upgrade_schema(db):
+    """
+    Bring an existing database up to date with the models.
+
+    Creates missing tables, adds model columns that older databases lack
+    and then creates missing indexes. SQLite can only add columns in place,
+    so changes are additive. Data that new tables and columns derive from
+    existing columns is backfilled before indexes are built over it.
+    """
+    db.create_all()
+    inspector = inspect(db.engine)
+    
+    for table in db.Model.metadata.sorted_tables:
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            logger.info("Adding column %s.%s (%s)", table.name, column.name, column_type)
+            db.session.execute(text(
+                f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+            ))
+    
+    db.session.commit()
+    
+    _backfill_problem_tags(db)
+    _backfill_problem_keys(db)
+    _backfill_problem_stats(db)
+    _backfill_numeric_columns(db)
+    _backfill_title_search(db)
+    
+    created = []
+    for table in db.Model.metadata.sorted_tables:
+        existing_indexes = {index['name'] for index in inspect(db.engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                logger.info("Creating index %s", index.name)
+                index.create(bind=db.engine)
+                created.append(index.name)
+    
+    # Refresh the query planner's statistics so it picks up the new indexes
+    if created:
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+def _backfill_problem_tags(db):
+    """Populate problem_tags from the comma-joined Problem.tags column"""
+    if db.session.query(problem_tags).first() is not None:
+        return
+    
+    tags_by_problem = {
+        problem_id: [name.strip() for name in tags.split(',')]
+        for problem_id, tags in db.session.query(Problem.id, Problem.tags).filter(Problem.tags != '')
+        if tags
+    }
+    if not tags_by_problem:
+        return
+    
+    logger.info("Backfilling tags for %d problems", len(tags_by_problem))
+    set_problem_tags(tags_by_problem)
+    db.session.commit()
+
+def _backfill_problem_keys(db):
+    """Derive Problem.problem_key from the URL of rows that lack one"""
+    rows = db.session.query(Problem.id, Problem.url).filter(Problem.problem_key.is_(None)).all()
+    if not rows:
+        return
+    
+    taken = {key for key, in db.session.query(Problem.problem_key).filter(Problem.problem_key.isnot(None))}
+    updates = []
+    for problem_id, url in rows:
+        key = make_problem_key(url) if url else None
+        # Leave duplicates without a key so the unique index can be built
+        if key and key not in taken:
+            taken.add(key)
+            updates.append({'id': problem_id, 'problem_key': key})
+    
+    logger.info("Backfilling problem keys for %d problems", len(updates))
+    db.session.bulk_update_mappings(Problem, updates)
+    db.session.commit()
+
+def _backfill_problem_stats(db):
+    """Count existing problems into problem_stats when it is empty"""
+    if db.session.query(ProblemStat).first() is not None:
+        return
+    if db.session.query(Problem.id).first() is None:
+        return
+    
+    logger.info("Backfilling problem statistics")
+    rebuild_problem_stats()
+    db.session.commit()
+
+def _backfill_numeric_columns(db):
+    """
+    Fill Problem.rating and Problem.solved_count from numeric difficulty and
+    points. Points of '0' are skipped, since that is also the placeholder of
+    platforms without solve counts; real zeros are filled in by the next
+    scrape.
+    """
+    updated = 0
+    for column, source, placeholder in (('rating', 'difficulty', ''), ('solved_count', 'points', '0')):
+        result = db.session.execute(text(
+            f"UPDATE problem SET {column} = CAST({source} AS INTEGER) "
+            f"WHERE {column} IS NULL AND {source} GLOB '[0-9]*' AND {source} NOT GLOB '*[^0-9]*' "
+            f"AND {source} != :placeholder"
+        ), {'placeholder': placeholder})
+        updated += result.rowcount
+    db.session.commit()
+    if updated:
+        logger.info("Backfilled %d ratings and solved counts", updated)
+
+def _backfill_title_search(db):
+    """Create the title search tables from the existing titles if they are missing"""
+    if create_title_search():
+        db.session.commit()
+        logger.info("Built the problem title search index")
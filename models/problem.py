@@ -1,3 +1,4 @@
+import hashlib
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
@@ -6,13 +7,53 @@ class Problem(db.Model):
     """
     Database model for storing DSA problems.
     """
+    __table_args__ = (
+        db.Index('ix_problem_problem_key', 'problem_key', unique=True),
+        db.Index('ix_problem_platform_title', 'platform', 'title'),
+        db.Index('ix_problem_platform_difficulty', 'platform', 'difficulty'),
+        db.Index('ix_problem_url', 'url'),
+        db.Index('ix_problem_rating_solved_count', 'rating', 'solved_count'),
+        db.Index('ix_problem_solved_count', 'solved_count'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     platform = db.Column(db.String(50), nullable=False)
     difficulty = db.Column(db.String(50))
     url = db.Column(db.String(200))
     points = db.Column(db.String(50))
-    tags = db.Column(db.String(200))
+    tags = db.Column(db.Text)
+    fingerprint = db.Column(db.String(40))
+    problem_key = db.Column(db.String(200))
+    # Typed copies of a numeric difficulty and of points, for range queries
+    rating = db.Column(db.Integer)
+    solved_count = db.Column(db.Integer)
+
+    @staticmethod
+    def compute_fingerprint(problem_data):
+        """
+        Hash the normalized mutable fields of a problem so unchanged rows
+        can be detected without comparing every column.
+        """
+        content = '\x1f'.join(
+            str(problem_data.get(field) or '')
+            for field in ('difficulty', 'url', 'points', 'tags', 'rating', 'solved_count')
+        )
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def parse_int(value):
+        """
+        Convert a numeric value such as a rating or solved count to int.
+
+        Returns:
+            int: The value, or None for labels like 'Easy' or 'Unknown'
+        """
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+        return None
 
     def __repr__(self):
         return f'<Problem {self.title}>'
@@ -28,5 +69,8 @@ class Problem(db.Model):
             'difficulty': self.difficulty,
             'url': self.url,
             'points': self.points,
-            'tags': self.tags
+            'tags': self.tags,
+            'problem_key': self.problem_key,
+            'rating': self.rating,
+            'solved_count': self.solved_count
         } 
\ No newline at end of file
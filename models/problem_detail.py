@@ -0,0 +1,32 @@
+from .problem import db
+
+class ProblemDetail(db.Model):
+    """
+    Database model for enriched problem details, such as the statement.
+
+    Kept out of the Problem table so listing queries don't drag large
+    text columns along. A problem without a row here has not been
+    enriched yet.
+    """
+    __tablename__ = 'problem_detail'
+
+    problem_id = db.Column(db.Integer, db.ForeignKey('problem.id'), primary_key=True)
+    description = db.Column(db.Text)
+    acceptance_rate = db.Column(db.Float)
+    likes = db.Column(db.Integer)
+    fetched_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<ProblemDetail {self.problem_id}>'
+
+    def to_dict(self):
+        """
+        Convert problem detail object to dictionary.
+        """
+        return {
+            'problem_id': self.problem_id,
+            'description': self.description,
+            'acceptance_rate': self.acceptance_rate,
+            'likes': self.likes,
+            'fetched_at': self.fetched_at.isoformat() if self.fetched_at else None
+        }
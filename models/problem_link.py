@@ -0,0 +1,99 @@
+from .problem import Problem, db
+
+class ProblemLink(db.Model):
+    """
+    Database model for a near-duplicate of a problem on another platform.
+
+    Every link is stored in both directions, so the duplicates of a problem
+    are read from the primary key alone.
+    """
+    __tablename__ = 'problem_links'
+
+    problem_id = db.Column(db.Integer, db.ForeignKey('problem.id'), primary_key=True)
+    linked_problem_id = db.Column(db.Integer, db.ForeignKey('problem.id'), primary_key=True)
+    similarity = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<ProblemLink {self.problem_id} -> {self.linked_problem_id}>'
+
+def replace_problem_links(links, batch_size=500):
+    """
+    Make the stored links exactly the given ones, rewriting only the
+    problems whose links changed.
+
+    The caller is responsible for committing.
+
+    Args:
+        links (dict): (problem id, other problem id) -> similarity, one
+            entry per pair
+        batch_size (int): Rows per delete/insert statement
+
+    Returns:
+        set: Ids of problems whose links were added, removed or changed
+    """
+    rows = {}
+    for (problem_id, other_id), similarity in links.items():
+        rows[(problem_id, other_id)] = similarity
+        rows[(other_id, problem_id)] = similarity
+
+    existing = {
+        (problem_id, other_id): similarity
+        for problem_id, other_id, similarity in db.session.query(
+            ProblemLink.problem_id, ProblemLink.linked_problem_id, ProblemLink.similarity
+        )
+    }
+    # Links are stored both ways, so this covers the problems at either end
+    changed = {
+        problem_id for problem_id, other_id in set(rows) | set(existing)
+        if rows.get((problem_id, other_id)) != existing.get((problem_id, other_id))
+    }
+
+    table = ProblemLink.__table__
+    problem_ids = list(changed)
+    for start in range(0, len(problem_ids), batch_size):
+        db.session.execute(table.delete().where(
+            table.c.problem_id.in_(problem_ids[start:start + batch_size])
+        ))
+
+    inserts = [
+        {'problem_id': problem_id, 'linked_problem_id': other_id, 'similarity': similarity}
+        for (problem_id, other_id), similarity in rows.items() if problem_id in changed
+    ]
+    for start in range(0, len(inserts), batch_size):
+        db.session.execute(table.insert(), inserts[start:start + batch_size])
+    return changed
+
+def get_problem_links(problem_ids):
+    """
+    Get the near-duplicates of many problems with one query.
+
+    Args:
+        problem_ids (iterable): Problem ids
+
+    Returns:
+        dict: problem id -> list of dicts with the linked problem's id,
+        platform, title, url and similarity, most similar first
+    """
+    problem_ids = set(problem_ids)
+    if not problem_ids:
+        return {}
+
+    links = {}
+    query = (
+        db.session.query(
+            ProblemLink.problem_id, ProblemLink.similarity,
+            Problem.id, Problem.platform, Problem.title, Problem.url
+        )
+        .join(Problem, Problem.id == ProblemLink.linked_problem_id)
+        .filter(ProblemLink.problem_id.in_(problem_ids))
+        .order_by(ProblemLink.problem_id, ProblemLink.similarity.desc(), Problem.id)
+    )
+    for problem_id, similarity, linked_id, platform, title, url in query:
+        links.setdefault(problem_id, []).append({
+            'id': linked_id,
+            'platform': platform,
+            'title': title,
+            'url': url,
+            'similarity': similarity
+        })
+    return links
@@ -0,0 +1,58 @@
+from sqlalchemy.dialects.sqlite import insert
+from .problem import Problem, db
+
+class ProblemStat(db.Model):
+    """
+    Database model for the number of problems per platform and difficulty.
+
+    Kept up to date by the scraper service in the same transaction as the
+    problem rows, so statistics can be read without scanning the problem
+    table.
+    """
+    __tablename__ = 'problem_stats'
+
+    platform = db.Column(db.String(50), primary_key=True)
+    difficulty = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ProblemStat {self.platform} {self.difficulty}: {self.count}>'
+
+def apply_problem_stat_deltas(deltas):
+    """
+    Add per platform and difficulty deltas to the problem counts.
+
+    The caller is responsible for committing, normally together with the
+    problem rows the deltas describe.
+
+    Args:
+        deltas (dict): (platform, difficulty) -> change in count
+    """
+    rows = [
+        {'platform': platform, 'difficulty': difficulty or '', 'count': delta}
+        for (platform, difficulty), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+
+    statement = insert(ProblemStat.__table__)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['platform', 'difficulty'],
+        set_={'count': ProblemStat.__table__.c['count'] + statement.excluded['count']}
+    ), rows)
+
+def rebuild_problem_stats():
+    """
+    Recount the problem statistics from the problem table.
+
+    The caller is responsible for committing.
+    """
+    db.session.query(ProblemStat).delete()
+    deltas = {}
+    for platform, difficulty, count in (
+        db.session.query(Problem.platform, Problem.difficulty, db.func.count(Problem.id))
+        .group_by(Problem.platform, Problem.difficulty)
+    ):
+        key = (platform, difficulty or '')
+        deltas[key] = deltas.get(key, 0) + count
+    apply_problem_stat_deltas(deltas)
@@ -0,0 +1,72 @@
+from .problem import db
+
+# Association between problems and tags, indexed in both directions
+problem_tags = db.Table(
+    'problem_tags',
+    db.Column('problem_id', db.Integer, db.ForeignKey('problem.id'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id'), primary_key=True),
+    db.Index('ix_problem_tags_tag_id_problem_id', 'tag_id', 'problem_id')
+)
+
+class Tag(db.Model):
+    """
+    Database model for a normalized problem tag.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f'<Tag {self.name}>'
+
+def get_tag_ids(names):
+    """
+    Map tag names to ids, creating any tags that don't exist yet.
+
+    Args:
+        names (iterable): Tag names
+
+    Returns:
+        dict: tag name -> tag id
+    """
+    names = set(names)
+    if not names:
+        return {}
+    
+    tag_ids = dict(db.session.query(Tag.name, Tag.id).filter(Tag.name.in_(names)))
+    missing = names - set(tag_ids)
+    if missing:
+        db.session.execute(Tag.__table__.insert(), [{'name': name} for name in missing])
+        tag_ids.update(db.session.query(Tag.name, Tag.id).filter(Tag.name.in_(missing)))
+    return tag_ids
+
+def set_problem_tags(tags_by_problem, batch_size=500):
+    """
+    Replace the tag associations of many problems in bulk.
+
+    Existing associations are deleted and the new ones inserted in
+    executemany batches. The caller is responsible for committing.
+
+    Args:
+        tags_by_problem (dict): problem id -> list of tag names
+        batch_size (int): Rows per delete/insert statement
+    """
+    if not tags_by_problem:
+        return
+    
+    tag_ids = get_tag_ids(
+        name for tags in tags_by_problem.values() for name in tags if name
+    )
+    
+    problem_ids = list(tags_by_problem)
+    for start in range(0, len(problem_ids), batch_size):
+        db.session.execute(problem_tags.delete().where(
+            problem_tags.c.problem_id.in_(problem_ids[start:start + batch_size])
+        ))
+    
+    rows = [
+        {'problem_id': problem_id, 'tag_id': tag_ids[name]}
+        for problem_id, tags in tags_by_problem.items()
+        for name in set(tags) if name
+    ]
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(problem_tags.insert(), rows[start:start + batch_size])
@@ -0,0 +1,151 @@
+import re
+from sqlalchemy import bindparam, inspect, text
+from .problem import db
+
+# FTS5 table of problem titles, with the problem id as its rowid
+TITLE_SEARCH_TABLE = 'problem_title_search'
+
+# Distinct words of all titles, and an FTS5 table of them for finding close
+# spellings of misspelt query words. Words of renamed titles are kept, they
+# only suggest spellings that no title matches.
+TITLE_WORD_TABLE = 'problem_title_word'
+TITLE_WORD_SEARCH_TABLE = 'problem_title_word_search'
+
+# Matches above which the most solved are found by walking the solved_count
+# index rather than sorting every match
+BROAD_MATCHES = 1000
+
+_WORD = re.compile(r'\w+')
+
+def title_words(title):
+    """
+    Split a title or search text into lowercase words that can be searched,
+    which are those of at least three characters since the index is made of
+    trigrams.
+    """
+    return [word for word in _WORD.findall(title.lower()) if len(word) >= 3]
+
+def create_title_search():
+    """
+    Create the title search tables and index every existing title, unless
+    they already exist.
+
+    The trigram tokenizer indexes every three character sequence of a title,
+    case-insensitively, so any substring of three or more characters can be
+    looked up without scanning the problem table. The caller is responsible
+    for committing.
+
+    Returns:
+        bool: True if the tables were created
+    """
+    if TITLE_SEARCH_TABLE in inspect(db.engine).get_table_names():
+        return False
+
+    for statement in (
+        f"CREATE VIRTUAL TABLE {TITLE_SEARCH_TABLE} USING fts5(title, tokenize='trigram')",
+        f"CREATE TABLE {TITLE_WORD_TABLE} (id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE {TITLE_WORD_SEARCH_TABLE} USING fts5(word, tokenize='trigram')",
+        f"INSERT INTO {TITLE_SEARCH_TABLE} (rowid, title) SELECT id, title FROM problem"
+    ):
+        db.session.execute(text(statement))
+    _index_words(title for title, in db.session.execute(text("SELECT title FROM problem")))
+    return True
+
+def index_problem_titles(problem_ids, batch_size=500):
+    """
+    Replace the indexed titles of the given problems with their current ones.
+
+    The caller is responsible for committing, normally together with the
+    problem rows.
+
+    Args:
+        problem_ids (iterable): Ids of inserted or renamed problems
+        batch_size (int): Problems per delete/insert statement
+    """
+    delete = text(f"DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid IN :ids")
+    insert = text(
+        f"INSERT INTO {TITLE_SEARCH_TABLE} (rowid, title) SELECT id, title FROM problem WHERE id IN :ids"
+    )
+    select = text("SELECT title FROM problem WHERE id IN :ids")
+
+    problem_ids = list(problem_ids)
+    for start in range(0, len(problem_ids), batch_size):
+        params = {'ids': problem_ids[start:start + batch_size]}
+        for statement in (delete, insert):
+            db.session.execute(statement.bindparams(bindparam('ids', expanding=True)), params)
+        _index_words(
+            title for title, in db.session.execute(select.bindparams(bindparam('ids', expanding=True)), params)
+        )
+
+def _index_words(titles):
+    """Add the words of titles that aren't known yet to the word tables"""
+    words = {word for title in titles for word in title_words(title)}
+    if not words:
+        return
+
+    last_id = db.session.execute(text(f"SELECT coalesce(max(id), 0) FROM {TITLE_WORD_TABLE}")).scalar()
+    db.session.execute(
+        text(f"INSERT OR IGNORE INTO {TITLE_WORD_TABLE} (word) VALUES (:word)"),
+        [{'word': word} for word in words]
+    )
+    db.session.execute(text(
+        f"INSERT INTO {TITLE_WORD_SEARCH_TABLE} (rowid, word) "
+        f"SELECT id, word FROM {TITLE_WORD_TABLE} WHERE id > :last_id"
+    ), {'last_id': last_id})
+
+def match_titles(match, platform=None, limit=100):
+    """
+    Find the most solved problems whose title matches an FTS5 query.
+
+    A handful of matches are read through the search index and sorted.
+    When there are more than BROAD_MATCHES, the solved_count index is walked
+    instead until enough of them are found.
+
+    Args:
+        match (str): FTS5 query over the title column
+        platform (str): Only problems from this platform
+        limit (int): Maximum number of rows
+
+    Returns:
+        list: (id, title, solved_count) rows, most solved first
+    """
+    params = {'match': match, 'platform': platform, 'limit': limit, 'broad': BROAD_MATCHES}
+    if platform:
+        matches = (
+            f"SELECT 1 FROM {TITLE_SEARCH_TABLE} s JOIN problem p ON p.id = s.rowid "
+            f"WHERE s.title MATCH :match AND p.platform = :platform"
+        )
+    else:
+        matches = f"SELECT 1 FROM {TITLE_SEARCH_TABLE} s WHERE s.title MATCH :match"
+    count = db.session.execute(text(f"SELECT count(*) FROM ({matches} LIMIT :broad)"), params).scalar()
+
+    platform_filter = 'AND p.platform = :platform' if platform else ''
+    if count < BROAD_MATCHES:
+        query = (
+            f"SELECT p.id, p.title, p.solved_count FROM {TITLE_SEARCH_TABLE} s "
+            f"JOIN problem p ON p.id = s.rowid "
+            f"WHERE s.title MATCH :match {platform_filter} "
+            f"ORDER BY p.solved_count DESC, p.id LIMIT :limit"
+        )
+    else:
+        query = (
+            f"SELECT p.id, p.title, p.solved_count FROM problem p INDEXED BY ix_problem_solved_count "
+            f"WHERE p.id IN (SELECT rowid FROM {TITLE_SEARCH_TABLE} WHERE title MATCH :match) "
+            f"{platform_filter} ORDER BY p.solved_count DESC LIMIT :limit"
+        )
+    return db.session.execute(text(query), params).fetchall()
+
+def match_title_words(match, limit=100):
+    """
+    Find words used in titles that match an FTS5 query.
+
+    Args:
+        match (str): FTS5 query over the word column
+        limit (int): Maximum number of words
+
+    Returns:
+        list: Matching words, best matches by BM25 first
+    """
+    return [word for word, in db.session.execute(text(
+        f"SELECT word FROM {TITLE_WORD_SEARCH_TABLE} WHERE word MATCH :match ORDER BY rank LIMIT :limit"
+    ), {'match': match, 'limit': limit})]
@@ -1,10 +1,45 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import logging
 import requests
+import tempfile
 from bs4 import BeautifulSoup
+from .http_cache import STREAM_CHUNK_SIZE, get_shared_cache
+from .http_client import get_shared_client
+from .registry import register_scraper
+
+logger = logging.getLogger(__name__)
+
+# Prefer the much faster lxml parser when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 class BaseScraper(ABC):
+    # Platform name the scraper registers under, e.g. 'leetcode'
+    platform = None
+
+    # Seconds to wait for get_problems, None uses the service default
+    scrape_timeout = None
+
+    # Whether get_problem_details returns real data worth persisting
+    supports_details = True
+
+    # Problems handed to get_problem_details_batch at once
+    details_batch_size = 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.platform:
+            register_scraper(cls.platform, cls)
+
     def __init__(self):
-        self.session = requests.Session()
+        # Pooled, retrying and throttled transport shared by all scrapers
+        self.http = get_shared_client()
+        self.session = self.http.session
+        self.http_cache = get_shared_cache()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -14,23 +49,100 @@ class BaseScraper(ABC):
         """Fetch problems from the platform"""
         pass
 
+    def iter_problems(self):
+        """
+        Yield problems from the platform one at a time.
+
+        The service consumes this in fixed-size batches, so scrapers that can
+        parse their listing incrementally override it to keep memory bounded
+        by the batch size rather than the platform's catalogue.
+        """
+        yield from self.get_problems()
+
     @abstractmethod
     def get_problem_details(self, problem_url):
         """Get detailed information about a specific problem"""
         pass
 
+    def get_problem_details_batch(self, problem_urls):
+        """
+        Get details for several problems, in the same order as the URLs.
+
+        Scrapers whose platform can answer many problems in one request
+        override this together with details_batch_size.
+        """
+        return [self.get_problem_details(url) for url in problem_urls]
+
+    def base_title(self, title):
+        """
+        Get a problem's own name from a stored title, without anything the
+        scraper adds to it, so titles can be compared across platforms.
+        """
+        return title
+
     def _make_request(self, url):
-        """Make HTTP request with error handling"""
+        """Make HTTP GET request with error handling, through the shared HTTP cache"""
         try:
-            response = self.session.get(url, headers=self.headers)
+            if self.http_cache:
+                return self.http_cache.fetch(self.http, url, headers=self.headers)
+            response = self.http.get(url, headers=self.headers)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
-            print(f"Error fetching {url}: {str(e)}")
+            logger.error("Error fetching %s: %s", url, e)
             return None
 
-    def _parse_html(self, html_content):
-        """Parse HTML content using BeautifulSoup"""
+    @contextmanager
+    def _open_stream(self, url):
+        """
+        Open the body of an HTTP GET as a text file without reading it into
+        memory, for incremental parsing of large payloads.
+
+        The body is streamed to the shared HTTP cache, or to a temporary file
+        when caching is disabled, so it can also be read more than once.
+        Yields None if the request fails.
+        """
+        try:
+            if self.http_cache:
+                path, encoding = self.http_cache.fetch_file(self.http, url, headers=self.headers)
+                body = open(path, 'r', encoding=encoding)
+            else:
+                body = self._spool(url)
+        except requests.RequestException as e:
+            logger.error("Error fetching %s: %s", url, e)
+            yield None
+            return
+
+        with body:
+            yield body
+
+    def _spool(self, url):
+        """Stream a response into a temporary file and rewind it"""
+        response = self.http.get(url, headers=self.headers, stream=True)
+        try:
+            response.raise_for_status()
+            response.encoding = response.encoding or 'utf-8'
+            body = tempfile.TemporaryFile('w+', encoding='utf-8')
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE, decode_unicode=True):
+                body.write(chunk)
+        finally:
+            response.close()
+        body.seek(0)
+        return body
+
+    def _read_chunks(self, body):
+        """Read an open body from the start in STREAM_CHUNK_SIZE pieces"""
+        body.seek(0)
+        return iter(lambda: body.read(STREAM_CHUNK_SIZE), '')
+
+    def _parse_html(self, html_content, parse_only=None):
+        """
+        Parse HTML content using BeautifulSoup.
+
+        Uses lxml when it is installed and html.parser otherwise. Pass a
+        SoupStrainer as parse_only to build only the matching subtrees
+        instead of the whole page.
+        """
         if html_content:
-            return BeautifulSoup(html_content, 'html.parser')
+            return BeautifulSoup(html_content, HTML_PARSER, parse_only=parse_only)
         return None 
\ No newline at end of file
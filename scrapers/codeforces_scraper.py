@@ -1,9 +1,22 @@
 from .base_scraper import BaseScraper
-import requests
+from .json_stream import iter_json_path
+from utils.url_parser import make_problem_key
+from bs4 import SoupStrainer
+import re
 import time
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Only the statement and the tag boxes of a problem page are needed
+PROBLEM_PAGE_STRAINER = SoupStrainer(attrs={'class': ['problem-statement', 'tag-box']})
+
+# Contest id and problem index that titles start with, e.g. "4A - " or "1527B1 - "
+TITLE_PREFIX = re.compile(r'^\d+[A-Z]\d*\s+-\s+')
+
 class CodeforcesScraper(BaseScraper):
+    platform = 'codeforces'
+
     def __init__(self):
         super().__init__()
         self.base_url = "https://codeforces.com"
@@ -16,108 +29,113 @@ class CodeforcesScraper(BaseScraper):
     def get_problems(self):
         """Fetch problems from Codeforces using their API"""
         problems = []
-        print("Fetching problems from Codeforces API...")
-        
         try:
-            # Make direct API request
-            response = requests.get(self.api_url, headers=self.headers)
-            print(f"API Response Status Code: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"API request failed with status code: {response.status_code}")
-                return problems
-                
-            data = response.json()
-            print(f"API Response Status: {data.get('status')}")
-            
-            if data['status'] != 'OK':
-                print(f"API returned error: {data.get('comment', 'Unknown error')}")
-                return problems
-            
-            # Log the structure of the response
-            print(f"Number of problems in response: {len(data['result']['problems'])}")
-            print(f"Number of problem statistics: {len(data['result']['problemStatistics'])}")
-            
-            # Process problems
-            for problem in data['result']['problems']:
-                try:
-                    # Get problem statistics
-                    problem_stats = next(
-                        (stats for stats in data['result']['problemStatistics'] 
-                         if stats['contestId'] == problem['contestId'] and stats['index'] == problem['index']),
-                        None
-                    )
-                    
-                    # Skip problems without a name
-                    if not problem.get('name'):
-                        print(f"Skipping problem without name: {problem}")
-                        continue
-                        
-                    solved_count = str(problem_stats['solvedCount']) if problem_stats else '0'
-                    rating = str(problem['rating']) if 'rating' in problem else 'Unknown'
-                    
-                    # Create problem info
-                    problem_info = {
-                        'title': f"{problem['contestId']}{problem['index']} - {problem['name']}",
-                        'platform': 'codeforces',
-                        'difficulty': rating,
-                        'url': f"{self.base_url}/problemset/problem/{problem['contestId']}/{problem['index']}",
-                        'points': solved_count,
-                        'tags': problem.get('tags', [])
-                    }
-                    
-                    # Add to problems list
-                    problems.append(problem_info)
-                    print(f"Found problem: {problem_info['title']}")
-                    
-                except Exception as e:
-                    print(f"Error processing problem: {str(e)}")
-                    print(f"Problem data: {problem}")
-                    continue
-            
-            print(f"Total problems found: {len(problems)}")
-            return problems
-            
+            problems = list(self.iter_problems())
         except Exception as e:
-            print(f"Error fetching problems from API: {str(e)}")
-            return problems
+            logger.error("Error fetching problems from API: %s", e)
+        return problems
+
+    def iter_problems(self):
+        """
+        Stream problems from the problemset API.
+
+        The multi-megabyte response is written to disk and parsed
+        incrementally: a pass over problemStatistics builds the solved count
+        index, then problems are normalized and yielded one by one, so the
+        decoded payload is never held in memory.
+        """
+        logger.info("Fetching problems from Codeforces API")
+        with self._open_stream(self.api_url) as body:
+            if body is None:
+                logger.error("API request failed")
+                return
+
+            status = next(iter_json_path(self._read_chunks(body), ('status',)), None)
+            logger.debug("API Response Status: %s", status)
+            if status != 'OK':
+                comment = next(iter_json_path(self._read_chunks(body), ('comment',)), 'Unknown error')
+                logger.error("API returned error: %s", comment)
+                return
+
+            solved_counts = {
+                (stats.get('contestId'), stats.get('index')): stats.get('solvedCount', 0)
+                for stats in iter_json_path(self._read_chunks(body), ('result', 'problemStatistics'))
+            }
+            logger.debug("Number of problem statistics: %d", len(solved_counts))
+
+            count = 0
+            problems = iter_json_path(self._read_chunks(body), ('result', 'problems'))
+            for problem_info in self._iter_problems(problems, solved_counts):
+                count += 1
+                yield problem_info
+            logger.info("Total problems found: %d", count)
+
+    def _iter_problems(self, problems, solved_counts):
+        """
+        Normalize problemset.problems entries into problem_info dicts.
+
+        Args:
+            problems: Iterable of raw problem objects
+            solved_counts (dict): (contestId, index) -> solved count, so each
+                problem is joined with its statistics in constant time
+        """
+        for problem in problems:
+            try:
+                # Skip problems without a name
+                if not problem.get('name'):
+                    continue
+
+                key = (problem['contestId'], problem['index'])
+                solved_count = solved_counts.get(key, 0)
+                rating = str(problem['rating']) if 'rating' in problem else 'Unknown'
+
+                url = f"{self.base_url}/problemset/problem/{problem['contestId']}/{problem['index']}"
+                yield {
+                    'title': f"{problem['contestId']}{problem['index']} - {problem['name']}",
+                    'platform': 'codeforces',
+                    'difficulty': rating,
+                    'url': url,
+                    'problem_key': make_problem_key(url),
+                    'points': str(solved_count),
+                    'rating': problem.get('rating'),
+                    'solved_count': solved_count,
+                    'tags': problem.get('tags', [])
+                }
+
+            except Exception as e:
+                logger.warning("Error processing problem: %s", e)
+                logger.debug("Problem data: %s", problem)
+                continue
+
+    def base_title(self, title):
+        """Strip the contest id and problem index that titles are prefixed with"""
+        return TITLE_PREFIX.sub('', title, count=1)
 
     def get_problem_details(self, problem_url):
-        """Get detailed information about a specific problem"""
-        print(f"Fetching details for: {problem_url}")
+        """Get the statement and tags of a problem from its page"""
         details = {
             'description': '',
             'tags': []
         }
         
         try:
-            # Extract contest ID and problem index from URL
-            parts = problem_url.split('/')
-            contest_id = parts[-2]
-            problem_index = parts[-1]
-            
-            # Get problem details from API
-            api_url = f"{self.api_url}?tags={contest_id}{problem_index}"
-            response = requests.get(api_url, headers=self.headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['status'] == 'OK' and data['result']['problems']:
-                    problem = data['result']['problems'][0]
-                    details['tags'] = problem.get('tags', [])
-                    
-                    # Get problem statement from the website
-                    html_response = requests.get(problem_url, headers=self.headers)
-                    if html_response.status_code == 200:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(html_response.text, 'html.parser')
-                        statement_div = soup.find('div', class_='problem-statement')
-                        if statement_div:
-                            description_paragraphs = statement_div.find_all('div', class_=None)
-                            if description_paragraphs:
-                                details['description'] = description_paragraphs[0].text.strip()
+            # The problem page carries both the statement and the tags,
+            # so a single request is enough
+            soup = self._parse_html(self._make_request(problem_url), parse_only=PROBLEM_PAGE_STRAINER)
+            if soup:
+                statement_div = soup.find('div', class_='problem-statement')
+                if statement_div:
+                    description_paragraphs = statement_div.find_all('div', class_=None)
+                    if description_paragraphs:
+                        details['description'] = description_paragraphs[0].text.strip()
+                
+                # Skip the "*1600" difficulty pseudo-tag
+                details['tags'] = [
+                    tag.text.strip() for tag in soup.find_all('span', class_='tag-box')
+                    if tag.text.strip() and not tag.text.strip().startswith('*')
+                ]
         
         except Exception as e:
-            print(f"Error fetching problem details: {str(e)}")
+            logger.error("Error fetching problem details for %s: %s", problem_url, e)
         
-        return details 
\ No newline at end of file
+        return details
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import requests
+from .http_client import RETRY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the network per write when streaming a body to disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Share of max_bytes eviction frees the cache down to, so that a full cache
+# isn't rescanned on every write
+EVICTION_LOW_WATER = 0.9
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'http_cache'
+)
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP GET responses shared by all scrapers.
+
+    Entries younger than ttl seconds are served without touching the
+    network. Older entries are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged resource costs a 304 instead of a
+    full download. If revalidation fails to connect, times out or gets a
+    retryable error status, the stale copy is served instead. When the
+    cache grows past max_bytes the least recently used entries are evicted
+    until it is back under EVICTION_LOW_WATER of it.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=3600, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'revalidations': 0,
+            'stale': 0,
+            'evictions': 0
+        }
+        self._total_bytes = None
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def fetch(self, client, url, headers=None, timeout=None):
+        """
+        GET a URL through the cache.
+
+        Args:
+            client: Anything with a requests-style get(), such as HTTPClient
+            url (str): The URL to fetch
+            headers (dict): Request headers
+            timeout: Request timeout passed to client.get()
+
+        Returns:
+            str: The response body
+
+        Raises:
+            requests.RequestException: If the request fails and no cached
+            copy can be used
+        """
+        path, encoding = self.fetch_file(client, url, headers=headers, timeout=timeout)
+        with open(path, 'r', encoding=encoding) as f:
+            return f.read()
+
+    def fetch_file(self, client, url, headers=None, timeout=None):
+        """
+        GET a URL through the cache without holding the body in memory.
+
+        The response is streamed straight to the cache directory, so callers
+        can parse large payloads incrementally from disk.
+
+        Args:
+            Same as fetch()
+
+        Returns:
+            tuple: (path, encoding) of the cached body file
+        """
+        entry = self._load(url)
+        body_path = self._body_path(url)
+        if entry and not os.path.exists(body_path):
+            entry = None
+
+        if entry and time.time() - entry['stored_at'] < self.ttl:
+            self._count('hits')
+            self._touch(url)
+            return body_path, entry['encoding']
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = client.get(url, headers=request_headers, timeout=timeout, stream=True)
+        except requests.RequestException as e:
+            if not entry:
+                raise
+            return self._serve_stale(url, entry, body_path, e)
+        try:
+            if entry and response.status_code in RETRY_STATUSES:
+                return self._serve_stale(url, entry, body_path, f"status {response.status_code}")
+            if entry and response.status_code == 304:
+                self._count('revalidations')
+                entry['stored_at'] = time.time()
+                self._write_meta(url, entry)
+                self._touch(url)
+                return body_path, entry['encoding']
+
+            response.raise_for_status()
+            self._count('misses')
+            entry = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'encoding': response.encoding or 'utf-8',
+                'stored_at': time.time()
+            }
+            self._write_body(url, response.iter_content(STREAM_CHUNK_SIZE))
+            self._write_meta(url, entry)
+        finally:
+            response.close()
+        return body_path, entry['encoding']
+
+    def _serve_stale(self, url, entry, body_path, reason):
+        """Fall back to an expired entry, left expired so the next fetch retries"""
+        logger.warning("Serving stale cached copy of %s (%s)", url, reason)
+        self._count('stale')
+        return body_path, entry['encoding']
+
+    def stats(self):
+        """Get cache counters and current size"""
+        with self._lock:
+            stats = dict(self.counters)
+        stats['size_bytes'] = self._current_size()
+        return stats
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(('.json', '.body')):
+                    os.remove(os.path.join(self.directory, name))
+            self._total_bytes = 0
+
+    def _meta_path(self, url):
+        return os.path.join(self.directory, self._key(url) + '.json')
+
+    def _body_path(self, url):
+        return os.path.join(self.directory, self._key(url) + '.body')
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _load(self, url):
+        """Read an entry's metadata, or None if it is missing or unreadable"""
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries from before bodies were stored separately are refetched
+        return entry if 'encoding' in entry else None
+
+    def _write_meta(self, url, entry):
+        """Atomically replace an entry's metadata"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._meta_path(url))
+
+    def _write_body(self, url, chunks):
+        """Stream a body to disk, atomically replace the entry's body, then evict if over budget"""
+        path = self._body_path(url)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            total = self._scan_size() if self._total_bytes is None else self._total_bytes
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            new_size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+            self._total_bytes = total - old_size + new_size
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def _touch(self, url):
+        """Mark an entry as recently used for eviction ordering"""
+        try:
+            os.utime(self._body_path(url))
+        except OSError:
+            pass
+
+    def _evict(self, keep):
+        """Drop least recently used entries until under the low-water mark (lock held)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.body') and path != keep:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        target = self.max_bytes * EVICTION_LOW_WATER
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                os.remove(path[:-len('.body')] + '.json')
+            except OSError:
+                pass
+            self._total_bytes -= size
+            self.counters['evictions'] += 1
+
+    def _scan_size(self):
+        """Sum the size of all bodies on disk (lock held)"""
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith('.body'):
+                try:
+                    total += os.path.getsize(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+        return total
+
+    def _current_size(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            return self._total_bytes
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_cache():
+    """
+    Get the process-wide HTTP cache, configured from the environment.
+
+    HTTP_CACHE_ENABLED=0 disables caching, in which case None is returned.
+    HTTP_CACHE_DIR, HTTP_CACHE_TTL (seconds) and HTTP_CACHE_MAX_MB tune it.
+    """
+    global _shared_cache
+    if os.getenv('HTTP_CACHE_ENABLED', '1') == '0':
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache(
+                directory=os.getenv('HTTP_CACHE_DIR', DEFAULT_CACHE_DIR),
+                ttl=int(os.getenv('HTTP_CACHE_TTL', '3600')),
+                max_bytes=int(os.getenv('HTTP_CACHE_MAX_MB', '256')) * 1024 * 1024
+            )
+        return _shared_cache
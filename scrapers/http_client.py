@@ -0,0 +1,144 @@
+from urllib.parse import urlparse
+import logging
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing rate requests per second with bursts
+    of up to capacity.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now so concurrent callers queue up fairly
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+class HTTPClient:
+    """
+    HTTP transport shared by all scrapers.
+
+    Wraps one requests.Session with a sized keep-alive connection pool,
+    default connect/read timeouts, retries with exponential backoff and
+    jitter on connection errors, 429 and 5xx responses, and a per-host
+    token bucket throttle.
+    """
+    def __init__(self, pool_size=20, connect_timeout=5, read_timeout=30,
+                 max_retries=3, backoff_base=0.5, backoff_max=30,
+                 rate_per_host=5, burst_per_host=5, host_rates=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.host_rates = host_rates or {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request, throttled per host and retried on transient failures.
+
+        Returns:
+            requests.Response: The final response, which may still carry an
+            error status once retries are exhausted
+
+        Raises:
+            requests.RequestException: If the last attempt fails to connect
+            or times out
+        """
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        bucket = self._bucket(urlparse(url).netloc)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning("Request to %s failed (%s), retrying", url, e)
+                self._backoff(attempt)
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                logger.warning("Request to %s returned %d, retrying", url, response.status_code)
+                # Release the connection, which stays checked out for streamed responses
+                response.close()
+                self._backoff(attempt, response.headers.get('Retry-After'))
+                continue
+            return response
+
+    def _backoff(self, attempt, retry_after=None):
+        """Sleep with full-jitter exponential backoff, honouring Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(int(retry_after), self.backoff_max))
+        time.sleep(delay)
+
+    def _bucket(self, host):
+        with self._buckets_lock:
+            if host not in self._buckets:
+                rate, burst = self.host_rates.get(host, (self.rate_per_host, self.burst_per_host))
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_shared_client():
+    """
+    Get the process-wide HTTP client, configured from the environment.
+
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT (seconds),
+    HTTP_MAX_RETRIES, HTTP_RATE_PER_HOST (requests per second) and
+    HTTP_BURST_PER_HOST tune it.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient(
+                pool_size=int(os.getenv('HTTP_POOL_SIZE', '20')),
+                connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+                read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', '30')),
+                max_retries=int(os.getenv('HTTP_MAX_RETRIES', '3')),
+                rate_per_host=float(os.getenv('HTTP_RATE_PER_HOST', '5')),
+                burst_per_host=int(os.getenv('HTTP_BURST_PER_HOST', '5'))
+            )
+        return _shared_client
@@ -0,0 +1,143 @@
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# Characters that may follow a complete value
+_VALUE_END = _WHITESPACE + ',:]}'
+
+class _Reader:
+    """Buffered cursor over a stream of text chunks"""
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk, dropping consumed text. False at end of stream"""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Get the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def consume(self, expected):
+        """Consume the next character, which must be one of expected"""
+        ch = self.peek()
+        if ch not in expected:
+            raise ValueError(f"Expected one of {expected!r} but found {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut by a chunk boundary decodes as a shorter one ("1.5e3"
+            # split after "1." gives 1), so it's only complete once something
+            # that can follow a value comes after it
+            if (
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                and (end == len(self.buffer) or self.buffer[end] not in _VALUE_END)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+def iter_json_path(chunks, path):
+    """
+    Stream the value at path out of a JSON document.
+
+    If the value is an array its elements are yielded one at a time,
+    otherwise the value is yielded once. Everything outside the path is
+    skipped element by element, so memory is bounded by the largest single
+    array element rather than the document. Reading stops as soon as the
+    value has been produced.
+
+    Args:
+        chunks: Iterable of text chunks making up the document
+        path (tuple): Object keys leading to the value, e.g.
+            ('result', 'problems')
+    """
+    yield from _walk(_Reader(chunks), tuple(path), ())
+
+def _walk(reader, target, path):
+    if path == target:
+        if reader.peek() == '[':
+            yield from _array_items(reader)
+        else:
+            yield reader.value()
+        return True
+
+    if reader.peek() != '{':
+        _skip(reader)
+        return False
+
+    reader.consume('{')
+    if reader.peek() == '}':
+        reader.consume('}')
+        return False
+    while True:
+        key = reader.value()
+        reader.consume(':')
+        child = path + (key,)
+        if target[:len(child)] == child:
+            found = yield from _walk(reader, target, child)
+            if found:
+                return True
+        else:
+            _skip(reader)
+        if reader.consume(',}') == '}':
+            return False
+
+def _array_items(reader):
+    reader.consume('[')
+    if reader.peek() == ']':
+        reader.consume(']')
+        return
+    while True:
+        yield reader.value()
+        if reader.consume(',]') == ']':
+            return
+
+def _skip(reader):
+    """Skip the next value without materializing large arrays or objects"""
+    ch = reader.peek()
+    if ch == '[':
+        for _ in _array_items(reader):
+            pass
+    elif ch == '{':
+        reader.consume('{')
+        if reader.peek() == '}':
+            reader.consume('}')
+            return
+        while True:
+            reader.value()
+            reader.consume(':')
+            _skip(reader)
+            if reader.consume(',}') == '}':
+                return
+    else:
+        reader.value()
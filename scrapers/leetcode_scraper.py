@@ -1,45 +1,241 @@
 from .base_scraper import BaseScraper
+from .json_stream import iter_json_path
+from utils.url_parser import extract_problem_identifier, make_problem_key
 import json
+import logging
+import requests
 import time
 
+logger = logging.getLogger(__name__)
+
+# Questions requested per problemsetQuestionList page
+QUESTION_LIST_PAGE_SIZE = 100
+
+# Questions whose metadata is fetched in one aliased GraphQL request
+METADATA_BATCH_SIZE = 50
+
+QUESTION_LIST_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+  problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {
+    total: totalNum
+    questions: data {
+      difficulty
+      paidOnly: isPaidOnly
+      title
+      titleSlug
+      topicTags { name }
+    }
+  }
+}
+"""
+
+QUESTION_METADATA_FIELDS = """
+    titleSlug
+    content
+    likes
+    stats
+    topicTags { name }
+"""
+
 class LeetCodeScraper(BaseScraper):
+    platform = 'leetcode'
+
+    # Details come from batched GraphQL metadata requests
+    details_batch_size = METADATA_BATCH_SIZE
+
     def __init__(self):
         super().__init__()
         self.base_url = "https://leetcode.com"
         self.api_url = "https://leetcode.com/api/problems/all/"
+        self.graphql_url = "https://leetcode.com/graphql"
 
     def get_problems(self):
-        """Fetch all problems from LeetCode"""
-        problems = []
-        response = self._make_request(self.api_url)
-        
-        if response:
+        """Fetch all free problems from LeetCode"""
+        return list(self.iter_problems())
+
+    def iter_problems(self):
+        """
+        Yield all free problems from LeetCode, one page at a time.
+
+        Pages through the GraphQL problemsetQuestionList query, which also
+        carries topic tags. Acceptance rates are stored by detail
+        enrichment, with the rest of a problem's metadata. Falls back to the REST
+        problem list (without tags) if GraphQL is unavailable.
+        """
+        pages = 0
+        count = 0
+        for problems in self._iter_graphql_pages():
+            pages += 1
+            count += len(problems)
+            yield from problems
+
+        if pages:
+            logger.info("Total LeetCode problems found: %d", count)
+            return
+
+        logger.warning("LeetCode GraphQL unavailable, falling back to REST API")
+        yield from self._iter_problems_from_rest()
+
+    def get_problem_details(self, problem_url):
+        """Get detailed information about a specific problem"""
+        return self.get_problem_details_batch([problem_url])[0]
+
+    def get_problem_details_batch(self, problem_urls):
+        """
+        Get details for many problems with one GraphQL request per
+        METADATA_BATCH_SIZE problems.
+        """
+        slugs = [extract_problem_identifier(url)[1] for url in problem_urls]
+        metadata = self.get_question_metadata([slug for slug in slugs if slug])
+        return [
+            metadata.get(slug, {'description': '', 'tags': []}) if slug else {'description': '', 'tags': []}
+            for slug in slugs
+        ]
+
+    def get_question_metadata(self, slugs):
+        """
+        Fetch topic tags, acceptance rate, likes and statement for many
+        questions, batching METADATA_BATCH_SIZE slugs per request using
+        GraphQL aliases.
+
+        Returns:
+            dict: slug -> details dict
+        """
+        metadata = {}
+        for start in range(0, len(slugs), METADATA_BATCH_SIZE):
+            batch = slugs[start:start + METADATA_BATCH_SIZE]
+            data = self._graphql(self._build_metadata_query(batch))
+            if data is None:
+                continue
+            metadata.update(self._parse_metadata(data))
+        return metadata
+
+    def _iter_graphql_pages(self):
+        """
+        Page through problemsetQuestionList. Only pages that carried
+        questions are yielded.
+
+        If the first page fails nothing is yielded, so the caller can fall
+        back to REST. A later page failing raises, since the catalogue would
+        otherwise be reported as complete with only part of it stored.
+        """
+        skip = 0
+        total = None
+        while total is None or skip < total:
+            data = self._graphql(QUESTION_LIST_QUERY, {
+                'categorySlug': '',
+                'skip': skip,
+                'limit': QUESTION_LIST_PAGE_SIZE,
+                'filters': {}
+            })
+
+            # A null list comes with errors even on a 200, and is a failure
+            # rather than an empty catalogue
+            page = data.get('problemsetQuestionList') if data is not None else None
+            questions = page.get('questions') if isinstance(page, dict) else None
+            if not isinstance(questions, list):
+                logger.error("LeetCode GraphQL API returned no question list at offset %d", skip)
+                if total is None:
+                    return
+                raise RuntimeError(
+                    f"LeetCode GraphQL API failed at offset {skip} of {total}, "
+                    f"the problem list is incomplete"
+                )
+            if not questions:
+                break
+            total = page.get('total') or 0
+            yield self._parse_question_list(page)
+            skip += len(questions)
+
+    def _iter_problems_from_rest(self):
+        """Stream all free problems out of the REST problem list"""
+        with self._open_stream(self.api_url) as body:
+            if body is None:
+                return
             try:
-                data = json.loads(response)
-                for problem in data['stat_status_pairs']:
+                for problem in iter_json_path(self._read_chunks(body), ('stat_status_pairs',)):
                     if not problem['paid_only']:  # Only get free problems
-                        problem_info = {
+                        url = f"{self.base_url}/problems/{problem['stat']['question__title_slug']}/"
+                        yield {
                             'title': problem['stat']['question__title'],
                             'platform': 'leetcode',
                             'difficulty': self._get_difficulty(problem['difficulty']['level']),
-                            'url': f"{self.base_url}/problems/{problem['stat']['question__title_slug']}/",
+                            'url': url,
+                            'problem_key': make_problem_key(url),
                             'tags': []  # Tags will be fetched in get_problem_details
                         }
-                        problems.append(problem_info)
-            except json.JSONDecodeError as e:
-                print(f"Error parsing LeetCode API response: {str(e)}")
-        
+            except ValueError as e:
+                logger.error("Error parsing LeetCode API response: %s", e)
+
+    def _parse_question_list(self, page):
+        """Convert a problemsetQuestionList page into problem_info dicts"""
+        problems = []
+        for question in page.get('questions') or []:
+            if question.get('paidOnly'):  # Only get free problems
+                continue
+            url = f"{self.base_url}/problems/{question['titleSlug']}/"
+            problems.append({
+                'title': question['title'],
+                'platform': 'leetcode',
+                'difficulty': question.get('difficulty') or 'Unknown',
+                'url': url,
+                'problem_key': make_problem_key(url),
+                'tags': [tag['name'] for tag in question.get('topicTags') or []]
+            })
         return problems
 
-    def get_problem_details(self, problem_url):
-        """Get detailed information about a specific problem"""
-        # LeetCode's problem details are behind their GraphQL API
-        # This is a simplified version - in a real implementation, you'd need to
-        # handle their GraphQL API properly
-        return {
-            'description': 'Problem description would be fetched from GraphQL API',
-            'tags': ['Array', 'String']  # Example tags
-        }
+    def _build_metadata_query(self, slugs):
+        """Build one query fetching every slug under its own alias"""
+        fields = ''.join(
+            f'q{i}: question(titleSlug: {json.dumps(slug)}) {{{QUESTION_METADATA_FIELDS}}}\n'
+            for i, slug in enumerate(slugs)
+        )
+        return f'query questionMetadata {{\n{fields}}}'
+
+    def _parse_metadata(self, data):
+        """Convert an aliased question metadata response into details by slug"""
+        metadata = {}
+        for question in data.values():
+            if not question:
+                continue
+            soup = self._parse_html(question.get('content'))
+            metadata[question['titleSlug']] = {
+                'description': soup.get_text().strip() if soup else '',
+                'tags': [tag['name'] for tag in question.get('topicTags') or []],
+                'acceptance_rate': self._parse_acceptance_rate(question.get('stats')),
+                'likes': question.get('likes')
+            }
+        return metadata
+
+    def _parse_acceptance_rate(self, stats):
+        """Read the acceptance percentage out of the JSON-encoded stats field"""
+        try:
+            return float(json.loads(stats)['acRate'].rstrip('%'))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return None
+
+    def _graphql(self, query, variables=None):
+        """
+        Run a GraphQL query against LeetCode.
+
+        Returns:
+            dict: The response data, or None if the request failed
+        """
+        try:
+            response = self.http.post(
+                self.graphql_url,
+                json={'query': query, 'variables': variables or {}},
+                headers={**self.headers, 'Referer': self.base_url, 'Content-Type': 'application/json'}
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.error("Error querying LeetCode GraphQL API: %s", e)
+            return None
+
+        if payload.get('errors'):
+            logger.error("LeetCode GraphQL API returned errors: %s", payload['errors'])
+        return payload.get('data')
 
     def _get_difficulty(self, level):
         """Convert numeric difficulty level to string"""
@@ -48,4 +244,4 @@ class LeetCodeScraper(BaseScraper):
             2: 'Medium',
             3: 'Hard'
         }
-        return difficulty_map.get(level, 'Unknown') 
\ No newline at end of file
+        return difficulty_map.get(level, 'Unknown')
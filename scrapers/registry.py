@@ -0,0 +1,55 @@
+import importlib
+import pkgutil
+import threading
+
+# platform name -> BaseScraper subclass
+_scrapers = {}
+_discovered = False
+_lock = threading.RLock()
+
+def register_scraper(platform, scraper_class):
+    """
+    Register a scraper class under a platform name.
+
+    BaseScraper subclasses that set a platform attribute are registered
+    automatically when their module is imported.
+    """
+    with _lock:
+        existing = _scrapers.get(platform)
+        if existing is not None and existing is not scraper_class:
+            raise ValueError(
+                f"Platform '{platform}' is already registered to {existing.__name__}"
+            )
+        _scrapers[platform] = scraper_class
+
+def discover_scrapers():
+    """
+    Import every scrapers/*_scraper.py module once so the scrapers they
+    define register themselves. Adding a platform only needs a new module.
+    """
+    global _discovered
+    with _lock:
+        if _discovered:
+            return
+        package = importlib.import_module(__package__)
+        for module in pkgutil.iter_modules(package.__path__):
+            if module.name.endswith('_scraper') and module.name != 'base_scraper':
+                importlib.import_module(f"{__package__}.{module.name}")
+        _discovered = True
+
+def get_scraper_classes():
+    """Get all registered scraper classes by platform, discovering them on first use"""
+    discover_scrapers()
+    with _lock:
+        return dict(_scrapers)
+
+def get_platforms():
+    """Get the names of all registered platforms"""
+    return list(get_scraper_classes())
+
+def create_scrapers():
+    """Instantiate one scraper per registered platform"""
+    return {
+        platform: scraper_class()
+        for platform, scraper_class in get_scraper_classes().items()
+    }
@@ -0,0 +1,295 @@
+from array import array
+from bisect import bisect_left, bisect_right
+import heapq
+import random
+import re
+import threading
+from models import Tag, problem_tags
+from services.problem_query import QueryError, _parse_int
+
+DEFAULT_RECOMMEND_SIZE = 10
+MAX_RECOMMEND_SIZE = 100
+
+# Random draws per requested problem before sampling falls back to a scan
+SAMPLE_ATTEMPTS = 20
+
+# Matches below this share of the band are ranked by scanning them, above it
+# by walking the precomputed most-solved order until enough are found
+SOLVED_WALK_DENSITY = 0.05
+
+# Bit offsets set in each possible byte, for turning bitsets into positions
+_BIT_POSITIONS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+_NONZERO_BYTE = re.compile(b'[^\x00]')
+
+class ProblemCatalogue:
+    """
+    Immutable, read-optimized snapshot of every problem for recommendation
+    queries that never touch the database.
+
+    Problems are stored by position, sorted by rating with unrated problems
+    last, so a rating band is a contiguous position range found by bisecting
+    the rating column. Ratings, solved counts and ids are typed arrays. Each
+    tag and platform is a bitset (a Python int with bit i set for the
+    problem at position i), so combined filters are a few big-int ANDs.
+    """
+    def __init__(self, rows, tags_by_id, generation=None):
+        """
+        Args:
+            rows: (id, title, platform, difficulty, url, problem_key,
+                rating, solved_count, tags) tuples
+            tags_by_id (dict): problem id -> list of normalized tag names
+            generation: Version of the data the snapshot was built from
+        """
+        rows = sorted(rows, key=lambda row: (row[6] is None, row[6] or 0, row[0]))
+        self.generation = generation
+        self.size = len(rows)
+        self.ids = array('q', (row[0] for row in rows))
+        self.ratings = array('q', (row[6] for row in rows if row[6] is not None))
+        self.solved_counts = array('q', (row[7] or 0 for row in rows))
+        self._rows = rows
+        self._position_by_id = {problem_id: position for position, problem_id in enumerate(self.ids)}
+        self._by_solved = array('q', sorted(
+            range(self.size), key=lambda position: (-self.solved_counts[position], self.ids[position])
+        ))
+        self._nbytes = (self.size + 7) // 8
+
+        positions_by_tag = {}
+        positions_by_platform = {}
+        for position, row in enumerate(rows):
+            positions_by_platform.setdefault(row[2], []).append(position)
+            for name in tags_by_id.get(row[0], ()):
+                positions_by_tag.setdefault(name, []).append(position)
+        self.tag_bits = {name: self._bitset(positions) for name, positions in positions_by_tag.items()}
+        self.platform_bits = {name: self._bitset(positions) for name, positions in positions_by_platform.items()}
+
+    @classmethod
+    def build(cls, db, Problem, generation=None):
+        """Load a catalogue from the database"""
+        rows = db.session.query(
+            Problem.id, Problem.title, Problem.platform, Problem.difficulty, Problem.url,
+            Problem.problem_key, Problem.rating, Problem.solved_count, Problem.tags
+        ).all()
+        tags_by_id = {}
+        for problem_id, name in db.session.query(problem_tags.c.problem_id, Tag.name).join(
+            Tag, Tag.id == problem_tags.c.tag_id
+        ):
+            tags_by_id.setdefault(problem_id, []).append(name)
+        return cls([tuple(row) for row in rows], tags_by_id, generation)
+
+    def query(self, min_rating=None, max_rating=None, tags=(), platform=None,
+              exclude_ids=(), count=DEFAULT_RECOMMEND_SIZE, sort='random', rng=None):
+        """
+        Find problems matching every filter.
+
+        Args:
+            min_rating, max_rating (int): Inclusive rating band. Unrated
+                problems only match when neither is given
+            tags (iterable): Tags every problem must carry
+            platform (str): Only problems from this platform
+            exclude_ids (iterable): Problem ids to leave out, e.g. solved ones
+            count (int): Number of problems to return
+            sort (str): 'random' for a uniform sample, 'solved' for the most
+                solved first
+            rng: Optional random.Random for reproducible samples
+
+        Returns:
+            tuple: (number of matching problems, list of problem dicts)
+        """
+        lo, hi = self._band(min_rating, max_rating)
+
+        mask = self.platform_bits.get(platform, 0) if platform else None
+        for name in set(tags):
+            bits = self.tag_bits.get(name, 0)
+            mask = bits if mask is None else mask & bits
+
+        excluded = {self._position_by_id[problem_id] for problem_id in exclude_ids if problem_id in self._position_by_id}
+        excluded = {position for position in excluded if lo <= position < hi}
+        bitmap = mask.to_bytes(self._nbytes, 'little') if mask is not None else None
+        if bitmap is not None:
+            excluded = {position for position in excluded if self._is_set(bitmap, position)}
+        matched = self._count(mask, lo, hi) - len(excluded)
+
+        if count <= 0 or matched <= 0:
+            return max(matched, 0), []
+        if sort == 'solved':
+            positions = self._most_solved(bitmap, lo, hi, excluded, count, matched)
+        else:
+            positions = self._sample(bitmap, lo, hi, excluded, min(count, matched), rng or random)
+        return matched, [self._serialize(position) for position in positions]
+
+    def _band(self, min_rating, max_rating):
+        """Get the [lo, hi) position range of a rating band"""
+        if min_rating is None and max_rating is None:
+            return 0, self.size
+        lo = 0 if min_rating is None else bisect_left(self.ratings, min_rating)
+        hi = len(self.ratings) if max_rating is None else bisect_right(self.ratings, max_rating)
+        return lo, max(lo, hi)
+
+    def _bitset(self, positions):
+        bitmap = bytearray(self._nbytes)
+        for position in positions:
+            bitmap[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bitmap, 'little')
+
+    @staticmethod
+    def _is_set(bitmap, position):
+        return bitmap[position >> 3] >> (position & 7) & 1
+
+    @staticmethod
+    def _count(mask, lo, hi):
+        """Count set bits of mask in [lo, hi), or the whole range without a mask"""
+        if mask is None:
+            return hi - lo
+        return bin((mask >> lo) & ((1 << (hi - lo)) - 1)).count('1')
+
+    def _positions(self, bitmap, lo, hi, excluded):
+        """Yield every matching position in [lo, hi)"""
+        if bitmap is None:
+            for position in range(lo, hi):
+                if position not in excluded:
+                    yield position
+            return
+
+        for match in _NONZERO_BYTE.finditer(bitmap, lo >> 3, (hi + 7) >> 3):
+            base = match.start() << 3
+            for bit in _BIT_POSITIONS[bitmap[match.start()]]:
+                position = base + bit
+                if lo <= position < hi and position not in excluded:
+                    yield position
+
+    def _most_solved(self, bitmap, lo, hi, excluded, count, matched):
+        """Get up to count matching positions, most solved first"""
+        if matched < (hi - lo) * SOLVED_WALK_DENSITY:
+            return heapq.nsmallest(
+                count, self._positions(bitmap, lo, hi, excluded),
+                key=lambda position: (-self.solved_counts[position], self.ids[position])
+            )
+
+        positions = []
+        for position in self._by_solved:
+            if not lo <= position < hi or position in excluded:
+                continue
+            if bitmap is not None and not self._is_set(bitmap, position):
+                continue
+            positions.append(position)
+            if len(positions) == count:
+                break
+        return positions
+
+    def _sample(self, bitmap, lo, hi, excluded, count, rng):
+        """
+        Draw count distinct matching positions uniformly at random.
+
+        Random positions in the band are tried first, which is fast when
+        matches are dense. Sparse matches are listed and sampled instead.
+        """
+        # A dict keeps the draws in random order while skipping repeats
+        chosen = {}
+        for _ in range(count * SAMPLE_ATTEMPTS):
+            position = rng.randrange(lo, hi)
+            if position in excluded or (bitmap is not None and not self._is_set(bitmap, position)):
+                continue
+            chosen[position] = True
+            if len(chosen) == count:
+                return list(chosen)
+        return rng.sample(list(self._positions(bitmap, lo, hi, excluded)), count)
+
+    def _serialize(self, position):
+        (problem_id, title, platform, difficulty, url, problem_key,
+         rating, solved_count, tags) = self._rows[position]
+        return {
+            'id': problem_id,
+            'title': title,
+            'platform': platform,
+            'difficulty': difficulty,
+            'url': url,
+            'problem_key': problem_key,
+            'rating': rating,
+            'solved_count': solved_count,
+            'tags': tags.split(',') if tags else []
+        }
+
+class CatalogueHolder:
+    """
+    Holds the current ProblemCatalogue and replaces it atomically.
+
+    Readers take whatever snapshot is current. When the data version
+    reported by version() moves on, for example after a scrape committed in
+    another worker, one thread rebuilds the catalogue while the others keep
+    answering from the previous snapshot.
+    """
+    def __init__(self, loader, version):
+        """
+        Args:
+            loader: loader(generation) returning a new ProblemCatalogue
+            version: Callable returning the current data version
+        """
+        self.loader = loader
+        self.version = version
+        self._catalogue = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get the current catalogue, rebuilding it first if it is stale"""
+        catalogue = self._catalogue
+        generation = self.version()
+        if catalogue is not None and catalogue.generation == generation:
+            return catalogue
+
+        # Only the first reader to notice rebuilds, unless there's nothing to serve
+        if not self._lock.acquire(blocking=catalogue is None):
+            return catalogue
+        try:
+            if self._catalogue is None or self._catalogue.generation != generation:
+                self._catalogue = self.loader(generation)
+            return self._catalogue
+        finally:
+            self._lock.release()
+
+    def rebuild(self):
+        """Build a fresh catalogue now and swap it in"""
+        with self._lock:
+            self._catalogue = self.loader(self.version())
+            return self._catalogue
+
+def recommend_problems(catalogue, args):
+    """
+    Answer a recommendation request from a catalogue.
+
+    Supported arguments:
+        min_rating, max_rating: Inclusive rating band
+        tag: Required tag, may be repeated
+        platform: Only problems from this platform
+        exclude: Comma-separated problem ids to leave out (e.g. solved ones)
+        count: Number of problems, capped at MAX_RECOMMEND_SIZE
+        sort: 'random' (default) or 'solved' for the most solved first
+        seed: Optional integer making random samples reproducible
+
+    Returns:
+        dict: matched (problems matching the filters), count and problems
+    """
+    sort = args.get('sort', 'random')
+    if sort not in ('random', 'solved'):
+        raise QueryError("Parameter 'sort' must be 'random' or 'solved'")
+
+    try:
+        exclude_ids = {int(value) for value in args.get('exclude', '').split(',') if value.strip()}
+    except ValueError:
+        raise QueryError("Parameter 'exclude' must be comma-separated problem ids")
+
+    seed = _parse_int(args, 'seed', None)
+    matched, problems = catalogue.query(
+        min_rating=_parse_int(args, 'min_rating', None),
+        max_rating=_parse_int(args, 'max_rating', None),
+        tags=[tag.strip() for tag in args.getlist('tag') if tag.strip()],
+        platform=args.get('platform'),
+        exclude_ids=exclude_ids,
+        count=min(max(_parse_int(args, 'count', DEFAULT_RECOMMEND_SIZE), 1), MAX_RECOMMEND_SIZE),
+        sort=sort,
+        rng=random.Random(seed) if seed is not None else None
+    )
+    return {
+        'matched': matched,
+        'count': len(problems),
+        'problems': problems
+    }
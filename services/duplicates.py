@@ -0,0 +1,73 @@
+import math
+import re
+from collections import Counter
+
+# Minimum Jaccard similarity of two titles' words for a near-duplicate
+DUPLICATE_THRESHOLD = 0.8
+
+_WORD = re.compile(r'\w+')
+
+def title_tokens(title):
+    """
+    Normalize a title into the set of its words for comparison.
+
+    Words are lowercased with punctuation dropped, and a plural 's' is
+    stripped so "Palindromes" and "Palindrome" compare equal.
+    """
+    tokens = set()
+    for word in _WORD.findall(title.lower()):
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+def find_duplicates(problems, threshold=DUPLICATE_THRESHOLD):
+    """
+    Find pairs of problems on different platforms with near-identical titles.
+
+    Uses prefix filtering, as in the AllPairs similarity join: words are
+    ordered from rarest to most common, and a title is only indexed and
+    looked up under its first len(words) - ceil(threshold * len(words)) + 1
+    words. Two titles whose words have a Jaccard similarity of at least
+    threshold always share one of those, so only titles sharing a rare word
+    are compared instead of every pair, and none are missed. Titles of very
+    different lengths are skipped without comparing them.
+
+    Args:
+        problems: Iterable of (id, platform, title), with titles already
+            stripped of platform decorations
+        threshold (float): Minimum Jaccard similarity of the title words
+
+    Returns:
+        dict: (id, other id) -> similarity, with id < other id
+    """
+    documents = []
+    for problem_id, platform, title in problems:
+        tokens = title_tokens(title)
+        if tokens:
+            documents.append((problem_id, platform, tokens))
+
+    frequency = Counter(token for _, _, tokens in documents for token in tokens)
+    # token -> platform -> indexes of documents whose prefix holds the token
+    index = {}
+    duplicates = {}
+    for position, (problem_id, platform, tokens) in enumerate(documents):
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+
+        candidates = set()
+        for token in prefix:
+            by_platform = index.setdefault(token, {})
+            for other_platform, positions in by_platform.items():
+                if other_platform != platform:
+                    candidates.update(positions)
+            by_platform.setdefault(platform, []).append(position)
+
+        for candidate in candidates:
+            other_id, _, other_tokens = documents[candidate]
+            if not threshold * len(tokens) <= len(other_tokens) <= len(tokens) / threshold:
+                continue
+            similarity = len(tokens & other_tokens) / len(tokens | other_tokens)
+            if similarity >= threshold:
+                duplicates[(min(problem_id, other_id), max(problem_id, other_id))] = round(similarity, 4)
+    return duplicates
@@ -0,0 +1,442 @@
+import csv
+import io
+import json
+import re
+from sqlalchemy import func, select
+from models import Tag, get_problem_links, match_title_words, match_titles, problem_tags, title_words
+
+# Columns a client may request with the fields= parameter
+PROBLEM_FIELDS = (
+    'id', 'title', 'platform', 'difficulty', 'url', 'points', 'tags', 'problem_key',
+    'rating', 'solved_count'
+)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+DEFAULT_TOP_SIZE = 10
+MAX_TOP_SIZE = 100
+
+DEFAULT_SEARCH_SIZE = 20
+MAX_SEARCH_SIZE = 100
+
+# Titles read from the search index per requested problem, then re-ranked
+SEARCH_CANDIDATES_PER_RESULT = 3
+
+# Title words considered, and kept, as spellings of a misspelt query word
+WORD_CANDIDATES = 100
+WORD_VARIANTS = 3
+
+# Trigram similarity needed between a misspelt word and a title word, the
+# same default threshold as PostgreSQL's pg_trgm
+MIN_WORD_SIMILARITY = 0.3
+
+# Spellings less similar than the closest one by more than this are dropped
+WORD_VARIANT_MARGIN = 0.1
+
+# Rows fetched from the database cursor and written out per chunk when exporting
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+class QueryError(ValueError):
+    """Raised when request parameters for a problem query are invalid"""
+    pass
+
+def query_problems(Problem, args, platform=None):
+    """
+    Fetch one page of problems using keyset pagination on id.
+
+    Args:
+        Problem: The Problem model
+        args: Request arguments (a werkzeug MultiDict)
+        platform (str): Restrict results to this platform
+
+    Supported arguments:
+        cursor: Return problems with an id greater than this value
+        limit: Page size, capped at MAX_PAGE_SIZE
+        fields: Comma-separated columns to return
+        difficulty: Comma-separated difficulty labels or ratings
+        min_rating, max_rating: Inclusive numeric rating range
+        tag: Required tag, may be repeated to require several
+        min_solved: Minimum solved count
+
+    Returns:
+        dict: count, next_cursor (None on the last page) and problems
+    """
+    fields = _parse_fields(args.get('fields'))
+    limit = min(max(_parse_int(args, 'limit', DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    cursor = _parse_int(args, 'cursor', None)
+
+    # Always select id so the next cursor can be computed
+    selected = fields if 'id' in fields else ('id',) + fields
+    query = Problem.query.with_entities(*[getattr(Problem, field) for field in selected])
+    query = apply_filters(query, Problem, args, platform)
+    if cursor is not None:
+        query = query.filter(Problem.id > cursor)
+
+    rows = query.order_by(Problem.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        'count': len(rows),
+        'next_cursor': rows[-1].id if has_more else None,
+        'problems': attach_duplicates([serialize_row(row, fields) for row in rows])
+    }
+
+def export_problems(Problem, args, platform=None):
+    """
+    Stream every problem matching the filters as NDJSON or CSV.
+
+    Arguments are validated up front so errors surface before the response
+    starts. Rows are read from a server-side cursor in EXPORT_BATCH_SIZE
+    batches, so memory stays flat regardless of table size.
+
+    Args:
+        Problem: The Problem model
+        args: Request arguments, accepting format= plus the /problems filters
+        platform (str): Restrict results to this platform
+
+    Returns:
+        tuple: (mimetype, generator of text chunks)
+    """
+    export_format = args.get('format', 'ndjson')
+    if export_format not in EXPORT_MIMETYPES:
+        raise QueryError(f"Unsupported export format: {export_format}")
+    fields = _parse_fields(args.get('fields'))
+
+    query = Problem.query.with_entities(*[getattr(Problem, field) for field in fields])
+    query = apply_filters(query, Problem, args, platform)
+    query = query.order_by(Problem.id).execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+
+    if export_format == 'csv':
+        chunks = _csv_chunks(query, fields)
+    else:
+        chunks = _ndjson_chunks(query, fields)
+    return EXPORT_MIMETYPES[export_format], chunks
+
+def apply_filters(query, Problem, args, platform=None):
+    """Push platform, difficulty, rating, tag and solved count filters into SQL"""
+    if platform:
+        query = query.filter(Problem.platform == platform)
+
+    difficulty = args.get('difficulty')
+    if difficulty:
+        query = query.filter(Problem.difficulty.in_(
+            [value.strip() for value in difficulty.split(',') if value.strip()]
+        ))
+
+    # Only problems with a numeric difficulty (Codeforces ratings) have a rating
+    query = _filter_rating_band(query, Problem, args)
+
+    tags = {tag.strip() for tag in args.getlist('tag') if tag.strip()}
+    if tags:
+        query = query.filter(Problem.id.in_(tagged_problem_ids(tags)))
+
+    min_solved = _parse_int(args, 'min_solved', None)
+    if min_solved is not None:
+        query = query.filter(Problem.solved_count >= min_solved)
+
+    return query
+
+def top_solved(Problem, args, platform=None):
+    """
+    Get the most solved problems within a rating band.
+
+    Served from the (rating, solved_count) and solved_count indexes, so
+    only the band is read rather than the whole table.
+
+    Args:
+        Problem: The Problem model
+        args: Request arguments (a werkzeug MultiDict)
+        platform (str): Restrict results to this platform
+
+    Supported arguments:
+        min_rating, max_rating: Inclusive rating band, open-ended if omitted
+        limit: Number of problems, capped at MAX_TOP_SIZE
+        fields: Comma-separated columns to return
+
+    Returns:
+        dict: count and problems, most solved first
+    """
+    fields = _parse_fields(args.get('fields'))
+    limit = min(max(_parse_int(args, 'limit', DEFAULT_TOP_SIZE), 1), MAX_TOP_SIZE)
+
+    query = Problem.query.with_entities(*[getattr(Problem, field) for field in fields])
+    if platform:
+        query = query.filter(Problem.platform == platform)
+    query = _filter_rating_band(query, Problem, args).filter(
+        Problem.rating.isnot(None), Problem.solved_count.isnot(None)
+    )
+    rows = query.order_by(Problem.solved_count.desc(), Problem.id).limit(limit).all()
+
+    return {
+        'count': len(rows),
+        'problems': attach_duplicates([serialize_row(row, fields) for row in rows])
+    }
+
+def search_problems(Problem, args, platform=None):
+    """
+    Search problem titles, matching partial words and tolerating typos.
+
+    Titles containing the query as a phrase, then titles containing every
+    word of it in full or as part of a longer word, are looked up in the
+    trigram title index, most solved first. When there are fewer than
+    requested, query words that appear in no title are replaced by the
+    closest spellings used in titles and the search is repeated. Candidates
+    are ranked by relevance, then solved count.
+
+    Args:
+        Problem: The Problem model
+        args: Request arguments (a werkzeug MultiDict)
+        platform (str): Restrict results to this platform
+
+    Supported arguments:
+        q: Search text, with at least one word of three or more characters
+        limit: Number of problems, capped at MAX_SEARCH_SIZE
+        fields: Comma-separated columns to return
+
+    Returns:
+        dict: count and problems, best matches first
+    """
+    fields = _parse_fields(args.get('fields'))
+    limit = min(max(_parse_int(args, 'limit', DEFAULT_SEARCH_SIZE), 1), MAX_SEARCH_SIZE)
+    text = ' '.join(re.findall(r'\w+', args.get('q', '').lower()))
+    words = title_words(text)
+    if not words:
+        raise QueryError("Parameter 'q' must contain a word of at least 3 characters")
+
+    candidate_limit = limit * SEARCH_CANDIDATES_PER_RESULT
+    # Titles containing the whole phrase first, so they aren't crowded out
+    # by more solved titles merely containing every word
+    candidates = {}
+    if len(words) > 1:
+        candidates = {row.id: row for row in match_titles(_fts_phrase(text), platform, candidate_limit)}
+    if len(candidates) < limit:
+        for row in match_titles(_all_of([[word] for word in words]), platform, candidate_limit):
+            candidates.setdefault(row.id, row)
+    if len(candidates) < limit:
+        variants = [_word_variants(word) for word in words]
+        if all(variants) and variants != [[word] for word in words]:
+            for row in match_titles(_all_of(variants), platform, candidate_limit):
+                candidates.setdefault(row.id, row)
+
+    word_trigrams = [_padded_trigrams(word) for word in words]
+    scored = []
+    for row in candidates.values():
+        relevance = _title_relevance(text, words, word_trigrams, row.title.lower())
+        if relevance >= MIN_WORD_SIMILARITY:
+            scored.append((-relevance, -(row.solved_count or 0), row.id))
+    ids = [problem_id for _, _, problem_id in sorted(scored)[:limit]]
+
+    rows = {}
+    if ids:
+        query = Problem.query.with_entities(*[getattr(Problem, field) for field in set(fields) | {'id'}])
+        rows = {row.id: row for row in query.filter(Problem.id.in_(ids))}
+    return {
+        'count': len(rows),
+        'problems': attach_duplicates([
+            serialize_row(rows[problem_id], fields) for problem_id in ids if problem_id in rows
+        ])
+    }
+
+def _title_relevance(text, words, word_trigrams, title):
+    """
+    Score how well a lowercased title matches a query.
+
+    Titles containing every word score 1, plus 1 if every word starts a
+    title word, plus 1 for the whole query as a phrase and 1 more for an
+    exact title. Others score below 1: the average similarity of each query
+    word to its closest title word.
+    """
+    words_in_title = title_words(title)
+    if all(word in title for word in words):
+        return (
+            1
+            + all(any(title_word.startswith(word) for title_word in words_in_title) for word in words)
+            + (text in title)
+            + (text == title)
+        )
+    
+    title_trigrams = [_padded_trigrams(title_word) for title_word in words_in_title]
+    if not title_trigrams:
+        return 0
+    return sum(
+        max(_similarity(trigrams, other) for other in title_trigrams)
+        for trigrams in word_trigrams
+    ) / len(word_trigrams)
+
+def _word_variants(word):
+    """
+    Get the spellings to search for a query word: the word itself if some
+    title contains it, otherwise the most similar words used in titles.
+    """
+    if match_title_words(_fts_phrase(word), limit=1):
+        return [word]
+    
+    trigrams = _padded_trigrams(word)
+    scored = sorted(
+        (-_similarity(trigrams, _padded_trigrams(other)), other)
+        for other in match_title_words(
+            ' OR '.join(_fts_phrase(word[i:i + 3]) for i in range(len(word) - 2)), limit=WORD_CANDIDATES
+        )
+    )
+    if not scored:
+        return []
+    cutoff = max(MIN_WORD_SIMILARITY, -scored[0][0] - WORD_VARIANT_MARGIN)
+    return [other for score, other in scored[:WORD_VARIANTS] if -score >= cutoff]
+
+def _similarity(trigrams, other):
+    """Jaccard similarity of two trigram sets"""
+    return len(trigrams & other) / len(trigrams | other)
+
+def _padded_trigrams(word):
+    """Trigrams of a word padded like pg_trgm, so its start and end weigh more"""
+    word = f'  {word} '
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+def _all_of(variants):
+    """Build an FTS5 query requiring one of the spellings of every word"""
+    return ' AND '.join(
+        '(' + ' OR '.join(map(_fts_phrase, spellings)) + ')' for spellings in variants
+    )
+
+def _fts_phrase(value):
+    """Quote a value as an FTS5 string, so it is matched literally"""
+    return '"' + value.replace('"', '""') + '"'
+
+def _filter_rating_band(query, Problem, args):
+    """Apply the inclusive min_rating/max_rating band to the rating column"""
+    min_rating = _parse_int(args, 'min_rating', None)
+    max_rating = _parse_int(args, 'max_rating', None)
+    if min_rating is not None:
+        query = query.filter(Problem.rating >= min_rating)
+    if max_rating is not None:
+        query = query.filter(Problem.rating <= max_rating)
+    return query
+
+def tagged_problem_ids(tags):
+    """
+    Build a subquery of ids of problems carrying every one of the given tags.
+
+    Resolved from the tag name and (tag_id, problem_id) indexes rather than
+    scanning Problem.tags.
+    """
+    tags = set(tags)
+    return (
+        select(problem_tags.c.problem_id)
+        .select_from(problem_tags.join(Tag, Tag.id == problem_tags.c.tag_id))
+        .where(Tag.name.in_(tags))
+        .group_by(problem_tags.c.problem_id)
+        .having(func.count() == len(tags))
+    )
+
+def tag_counts(db, Problem, platform=None):
+    """
+    Count problems per tag, most common first.
+
+    Args:
+        db: The SQLAlchemy database
+        Problem: The Problem model
+        platform (str): Only count problems from this platform
+
+    Returns:
+        list: dicts with the tag name and its problem count
+    """
+    query = (
+        select(Tag.name, func.count(problem_tags.c.problem_id).label('count'))
+        .select_from(Tag.__table__.join(problem_tags, Tag.id == problem_tags.c.tag_id))
+    )
+    if platform:
+        query = (
+            query.join(Problem, Problem.id == problem_tags.c.problem_id)
+            .where(Problem.platform == platform)
+        )
+    query = query.group_by(Tag.id).order_by(func.count(problem_tags.c.problem_id).desc(), Tag.name)
+    return [{'name': name, 'count': count} for name, count in db.session.execute(query)]
+
+def attach_duplicates(problems):
+    """
+    Add the near-duplicates on other platforms, found by the duplicates
+    job, to serialized problems that include their id. Looked up with one
+    query for all of them.
+    """
+    links = get_problem_links(problem['id'] for problem in problems if 'id' in problem)
+    for problem in problems:
+        if 'id' in problem:
+            problem['duplicates'] = links.get(problem['id'], [])
+    return problems
+
+def serialize_row(row, fields=PROBLEM_FIELDS):
+    """Convert a problem row to a dictionary containing only the given fields"""
+    data = {}
+    for field in fields:
+        value = getattr(row, field)
+        if field == 'tags':
+            value = value.split(',') if value else []
+        data[field] = value
+    return data
+
+def _ndjson_chunks(rows, fields):
+    """
+    Yield the first JSON document immediately, so the response starts
+    before a whole batch is read, then EXPORT_BATCH_SIZE lines at a time.
+    An export with no rows yields an empty chunk.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    yield json.dumps(serialize_row(first, fields)) + '\n' if first is not None else ''
+
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(serialize_row(row, fields)))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def _csv_chunks(rows, fields):
+    """Yield a CSV header immediately, then EXPORT_BATCH_SIZE rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+
+    buffer.seek(0)
+    buffer.truncate()
+    pending = 0
+    for row in rows:
+        writer.writerow([getattr(row, field) for field in fields])
+        pending += 1
+        if pending >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+def _parse_fields(raw):
+    """Parse the fields= projection, defaulting to every column"""
+    if not raw:
+        return PROBLEM_FIELDS
+    fields = tuple(field.strip() for field in raw.split(',') if field.strip())
+    unknown = [field for field in fields if field not in PROBLEM_FIELDS]
+    if unknown:
+        raise QueryError(f"Unknown fields: {', '.join(unknown)}")
+    return fields or PROBLEM_FIELDS
+
+def _parse_int(args, name, default):
+    """Read an integer argument, raising QueryError if it is malformed"""
+    raw = args.get(name)
+    if raw is None or raw == '':
+        return default
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise QueryError(f"Parameter '{name}' must be an integer")
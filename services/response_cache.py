@@ -0,0 +1,122 @@
+from collections import Counter
+import hashlib
+import threading
+import time
+
+# Scope of responses that cover every platform
+ALL_PLATFORMS = 'all'
+
+# Most requested pages re-rendered after an invalidation
+HOT_KEYS = 20
+
+# Distinct pages tracked for hotness before the counts are trimmed
+MAX_TRACKED_KEYS = 1000
+
+class ResponseCache:
+    """
+    Platform-scoped cache keys for the read endpoints.
+
+    Every key embeds its platform's current generation, which is stored in
+    the shared cache backend. Invalidating a platform is a single write
+    that every worker sees, after which its old entries are never read
+    again and simply expire. Pages covering all platforms have a scope of
+    their own that is invalidated whenever any platform changes.
+    """
+    def __init__(self, cache, hot_keys=HOT_KEYS):
+        """
+        Args:
+            cache: A Flask-Caching Cache shared by the workers
+            hot_keys (int): Number of most requested pages to warm
+        """
+        self.cache = cache
+        self.hot_keys = hot_keys
+        self._requests = Counter()
+        self._lock = threading.Lock()
+
+    def make_key(self, request, platform=None):
+        """
+        Build the cache key for a request and record the page as requested.
+
+        Args:
+            request: The current Flask request
+            platform (str): Platform the response covers, or None for all
+
+        Returns:
+            str: Key of the form view:scope:generation:hash, independent of
+            query argument order
+        """
+        scope = platform or ALL_PLATFORMS
+        query = tuple(sorted(request.args.items(multi=True)))
+        with self._lock:
+            self._requests[(scope, request.path, query)] += 1
+            if len(self._requests) > MAX_TRACKED_KEYS:
+                self._requests = Counter(dict(self._requests.most_common(MAX_TRACKED_KEYS // 2)))
+
+        digest = hashlib.sha1(repr((request.path, query)).encode('utf-8')).hexdigest()
+        return f"view:{scope}:{self.generation(scope)}:{digest}"
+
+    def invalidate(self, platforms):
+        """
+        Invalidate every cached response of the given platforms, and the
+        all-platform responses if any platform is given.
+
+        Returns:
+            list: The scopes that were invalidated
+        """
+        scopes = list(platforms)
+        if scopes:
+            scopes.append(ALL_PLATFORMS)
+        for scope in scopes:
+            # A fresh token instead of an increment needs no read-modify-write
+            self.cache.set(self._generation_key(scope), time.time_ns(), timeout=0)
+        return scopes
+
+    def hot_requests(self, scopes):
+        """
+        Get the most requested pages of the given scopes.
+
+        Returns:
+            list: (path, query) pairs, where query is a list of
+            (name, value) query arguments
+        """
+        scopes = set(scopes)
+        with self._lock:
+            ranked = self._requests.most_common()
+        hot = [
+            (path, list(query))
+            for (scope, path, query), _ in ranked
+            if scope in scopes
+        ]
+        return hot[:self.hot_keys]
+
+    def generation(self, scope=ALL_PLATFORMS):
+        """Get the current generation token of a scope, by default all platforms"""
+        key = self._generation_key(scope)
+        generation = self.cache.get(key)
+        if generation is None:
+            # Never fall back to an old generation if the backend evicted
+            # the counter, start a new one (add keeps another worker's)
+            self.cache.add(key, time.time_ns(), timeout=0)
+            generation = self.cache.get(key)
+        return generation
+
+    @staticmethod
+    def _generation_key(scope):
+        return f"generation:{scope}"
+
+def changed_platforms(results):
+    """
+    Get the platforms whose rows a background job changed.
+
+    Args:
+        results (dict): platform -> counters, as returned by
+            scrape_all_platforms, enrich_problem_details or
+            link_duplicates
+
+    Returns:
+        list: Platform names
+    """
+    return [
+        platform for platform, result in (results or {}).items()
+        if result.get('new') or result.get('updated') or result.get('enriched')
+    ]
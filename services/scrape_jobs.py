@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Number of finished jobs kept around for status lookups
+MAX_FINISHED_JOBS = 20
+
+class ScrapeJob:
+    """
+    State of a single background job, safe to read while it runs.
+    """
+    def __init__(self, kind='scrape', options=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.options = options or {}
+        self.status = 'queued'
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.platforms = {}
+        self.results = None
+        self.error = None
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update_platform(self, platform, **fields):
+        """Record progress for one platform"""
+        with self._lock:
+            state = self.platforms.setdefault(platform, {
+                'status': 'queued',
+                'fetched': 0,
+                'upserted': 0,
+                'elapsed_seconds': 0
+            })
+            state.update(fields)
+            state['elapsed_seconds'] = round(time.monotonic() - self._started, 3)
+
+    def set_status(self, status, results=None, error=None):
+        """Move the job to a new status"""
+        with self._lock:
+            self.status = status
+            if results is not None:
+                self.results = results
+            if error is not None:
+                self.error = error
+            if status in ('completed', 'failed'):
+                self.finished_at = datetime.now().isoformat()
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self):
+        """
+        Convert job state to dictionary.
+        """
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'options': self.options,
+                'status': self.status,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'elapsed_seconds': round(time.monotonic() - self._started, 3),
+                'platforms': {platform: dict(state) for platform, state in self.platforms.items()},
+                'results': self.results,
+                'error': self.error
+            }
+
+class ScrapeJobRunner:
+    """
+    Runs scrape, detail enrichment and duplicate linking jobs on background
+    threads, at most one of each kind at a time.
+
+    A job requested while another of the same kind is running is coalesced
+    into the running job instead of starting a duplicate. Jobs of different
+    kinds queue behind each other so the database keeps a single writer.
+    """
+    def __init__(self, app, scraper_service, db, Problem, on_complete=None):
+        """
+        Args:
+            on_complete: Optional callback given each finished job's results,
+                e.g. to invalidate cached responses
+        """
+        self.app = app
+        self.scraper_service = scraper_service
+        self.db = db
+        self.Problem = Problem
+        self.on_complete = on_complete
+        self._jobs = OrderedDict()
+        self._active_jobs = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def submit(self, kind='scrape', **options):
+        """
+        Start a job, or join the one of the same kind already running.
+
+        Args:
+            kind (str): 'scrape', 'enrich' or 'duplicates'
+            **options: Passed to the service method, e.g. platform and limit
+                for enrichment
+
+        Returns:
+            tuple: (job, created) where created is False if the request was
+            coalesced into a running job
+        """
+        if kind not in ('scrape', 'enrich', 'duplicates'):
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        with self._lock:
+            if kind in self._active_jobs:
+                return self._active_jobs[kind], False
+
+            job = ScrapeJob(kind, options)
+            self._jobs[job.id] = job
+            self._active_jobs[kind] = job
+            self._prune()
+
+        thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        thread.start()
+        return job, True
+
+    def get(self, job_id):
+        """Get a job by its id, or None if it is unknown"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job):
+        """Run a job inside an application context, one job at a time"""
+        with self._run_lock, self.app.app_context():
+            job.set_status('running')
+            try:
+                if job.kind == 'enrich':
+                    results = self.scraper_service.enrich_problem_details(
+                        self.db, self.Problem, progress=job.update_platform, **job.options
+                    )
+                elif job.kind == 'duplicates':
+                    results = self.scraper_service.link_duplicates(
+                        self.db, self.Problem, progress=job.update_platform
+                    )
+                else:
+                    results = self.scraper_service.scrape_all_platforms(
+                        self.db, self.Problem, progress=job.update_platform
+                    )
+            except Exception as e:
+                logger.exception("%s job %s failed: %s", job.kind.capitalize(), job.id, e)
+                self._finish(job, 'failed', error=str(e))
+                return
+            finally:
+                self.db.session.remove()
+
+            # The data is committed by now, so a failing hook (cache
+            # invalidation, warming) is logged without failing the job. It
+            # runs first so pollers only see completed once readers get the
+            # new data.
+            if self.on_complete:
+                try:
+                    self.on_complete(results)
+                except Exception as e:
+                    logger.exception("Completion hook of %s job %s failed: %s", job.kind, job.id, e)
+                finally:
+                    self.db.session.remove()
+            self._finish(job, 'completed', results=results)
+
+    def _finish(self, job, status, results=None, error=None):
+        """Move a job to a final status and let a new job of its kind start"""
+        with self._lock:
+            job.set_status(status, results=results, error=error)
+            if self._active_jobs.get(job.kind) is job:
+                del self._active_jobs[job.kind]
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
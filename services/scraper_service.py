@@ -1,121 +1,602 @@
-from scrapers.leetcode_scraper import LeetCodeScraper
-from scrapers.codeforces_scraper import CodeforcesScraper
+from scrapers.registry import create_scrapers
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import queue
+import threading
 import time
+from models import (
+    ProblemDetail, apply_problem_stat_deltas, index_problem_titles, replace_problem_links, set_problem_tags
+)
+from services.duplicates import find_duplicates
+from utils.metrics import JOB_PROBLEMS, StageTimer
+from utils.url_parser import make_problem_key
+
+logger = logging.getLogger(__name__)
+
+# Number of rows written per executemany batch
+BATCH_SIZE = 500
+
+# Seconds allowed for each platform's problems to be fetched and saved
+SCRAPE_TIMEOUT = 300
+
+# Fetched batches each platform may queue ahead of the database writer
+QUEUED_BATCHES = 2
+
+# Threads fetching problem details concurrently during enrichment
+DETAIL_WORKERS = 8
 
 class ScraperService:
-    def __init__(self, leetcode_scraper, codeforces_scraper):
-        self.leetcode_scraper = leetcode_scraper
-        self.codeforces_scraper = codeforces_scraper
+    def __init__(self, scrapers=None, timeout=SCRAPE_TIMEOUT, detail_workers=DETAIL_WORKERS):
+        """
+        Args:
+            scrapers (dict): platform -> scraper instance, defaults to one
+                instance of every registered scraper
+            timeout (int): Default seconds to wait for a platform's problems
+            detail_workers (int): Threads used for detail enrichment
+        """
+        self.scrapers = scrapers if scrapers is not None else create_scrapers()
+        self.timeout = timeout
+        self.detail_workers = detail_workers
 
-    def scrape_all_platforms(self, db, Problem):
-        """Scrape problems from all platforms"""
-        results = {}
+    def scrape_all_platforms(self, db, Problem, progress=None):
+        """
+        Scrape problems from all registered platforms.
+
+        Each platform streams its problems from a worker thread in
+        BATCH_SIZE batches through a bounded queue. Batches are upserted and
+        committed one at a time from the calling thread as they arrive, so
+        the database only ever sees a single writer and memory stays bounded
+        by the batch size rather than the size of a platform's catalogue.
+
+        Every platform has its own deadline (the scraper's scrape_timeout,
+        or the service timeout) covering both fetching and saving. Batches
+        committed before a platform times out or fails are kept.
+
+        If given, progress(platform, **fields) is called as each platform
+        moves through fetching, saving and done/error/timeout.
+
+        Time spent fetching (producing problems in the scraper), parsing
+        (normalizing them into rows), diffing against stored rows and
+        committing is reported per platform under 'timings'.
+        """
+        if progress is None:
+            progress = lambda platform, **fields: None
         
-        # Scrape LeetCode
-        try:
-            leetcode_problems = self.leetcode_scraper.get_problems()
-            leetcode_results = self._process_problems(db, Problem, leetcode_problems, 'leetcode')
-            results['leetcode'] = leetcode_results
-        except Exception as e:
-            results['leetcode'] = {
-                'total': 0,
-                'new': 0,
-                'updated': 0,
-                'errors': [str(e)]
-            }
+        results = {platform: self._empty_result() for platform in self.scrapers}
+        timers = {platform: StageTimer('scrape', platform) for platform in self.scrapers}
+        batches = queue.Queue(maxsize=QUEUED_BATCHES * max(len(self.scrapers), 1))
+        cancelled = {platform: threading.Event() for platform in self.scrapers}
+        executor = ThreadPoolExecutor(max_workers=max(len(self.scrapers), 1))
+        started = time.monotonic()
+        deadlines = {}
+        for platform, scraper in self.scrapers.items():
+            executor.submit(self._fetch_batches, platform, scraper, batches, cancelled[platform], timers[platform])
+            deadlines[platform] = started + self._timeout_for(scraper)
+            progress(platform, status='fetching')
         
-        # Scrape Codeforces
         try:
-            codeforces_problems = self.codeforces_scraper.get_problems()
-            codeforces_results = self._process_problems(db, Problem, codeforces_problems, 'codeforces')
-            results['codeforces'] = codeforces_results
-        except Exception as e:
-            results['codeforces'] = {
-                'total': 0,
-                'new': 0,
-                'updated': 0,
-                'errors': [str(e)]
-            }
+            pending = set(self.scrapers)
+            while pending:
+                remaining = max(min(deadlines[platform] for platform in pending) - time.monotonic(), 0)
+                try:
+                    platform, kind, payload = batches.get(timeout=remaining)
+                except queue.Empty:
+                    platform = None
+                
+                # Batches from platforms that already timed out are dropped
+                if platform in pending:
+                    result = results[platform]
+                    if kind == 'batch':
+                        progress(platform, status='saving', fetched=result['total'] + len(payload))
+                        self._merge_result(result, self._process_problems(db, Problem, payload, platform, timers[platform]))
+                        progress(platform, upserted=result['new'] + result['updated'])
+                    elif kind == 'done':
+                        pending.discard(platform)
+                        logger.info(
+                            "Finished %s: %d problems, %d new, %d updated, %d unchanged",
+                            platform, result['total'], result['new'], result['updated'], result['unchanged'],
+                            extra={f'{stage}_seconds': seconds for stage, seconds in timers[platform].totals().items()}
+                        )
+                        progress(platform, status='error' if result['errors'] else 'done')
+                    else:
+                        pending.discard(platform)
+                        logger.error("Scraping %s failed: %s", platform, payload)
+                        result['errors'].append(payload)
+                        progress(platform, status='error')
+                
+                now = time.monotonic()
+                for platform in [platform for platform in pending if deadlines[platform] <= now]:
+                    pending.discard(platform)
+                    cancelled[platform].set()
+                    timeout = self._timeout_for(self.scrapers[platform])
+                    logger.warning("Scraping %s timed out after %s seconds", platform, timeout)
+                    results[platform]['errors'].append(f"Timed out after {timeout} seconds")
+                    progress(platform, status='timeout')
+        finally:
+            # Stop producers that are still running and don't block on them
+            for event in cancelled.values():
+                event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
         
+        for platform, result in results.items():
+            result['timings'] = timers[platform].totals()
         return results
 
-    def _process_problems(self, db, Problem, problems, platform):
-        """Process and store problems in the database"""
-        total = len(problems)
+    def _fetch_batches(self, platform, scraper, batches, cancelled, timer):
+        """
+        Worker: stream a platform's problems onto the queue in BATCH_SIZE
+        batches, followed by a 'done' or 'error' message. The time the
+        scraper takes to produce each batch is recorded as the fetch stage,
+        waiting for room on the queue is not.
+        """
+        problems = None
+        try:
+            started = time.perf_counter()
+            # Inside the try so a scraper failing straight away reports its error
+            problems = scraper.iter_problems()
+            for batch in self._batched(problems, BATCH_SIZE):
+                timer.record('fetch', started)
+                if not self._put(batches, (platform, 'batch', batch), cancelled):
+                    return
+                started = time.perf_counter()
+            self._put(batches, (platform, 'done', None), cancelled)
+        except Exception as e:
+            self._put(batches, (platform, 'error', str(e)), cancelled)
+        finally:
+            # Release the scraper's open response or file early
+            close = getattr(problems, 'close', None)
+            if close:
+                close()
+
+    @staticmethod
+    def _put(batches, item, cancelled):
+        """Put onto the bounded queue, giving up once the platform is cancelled"""
+        while not cancelled.is_set():
+            try:
+                batches.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _timeout_for(self, scraper):
+        """Get the scrape timeout for a scraper"""
+        return scraper.scrape_timeout or self.timeout
+
+    @staticmethod
+    def _empty_result():
+        """Build the counters a platform's scrape starts from"""
+        return {
+            'total': 0,
+            'new': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'errors': []
+        }
+
+    @staticmethod
+    def _merge_result(result, batch_result):
+        """Add a batch's counters to a platform's running result"""
+        for counter in ('total', 'new', 'updated', 'unchanged'):
+            result[counter] += batch_result[counter]
+        result['errors'].extend(batch_result['errors'])
+
+    def _process_problems(self, db, Problem, problems, platform, timer=None):
+        """
+        Store problems in the database using bulk upserts.
+
+        Problems may be any iterable, including a generator. They are
+        processed and committed in BATCH_SIZE chunks, so only one chunk is
+        held in memory at a time.
+        """
+        if timer is None:
+            timer = StageTimer('scrape', platform)
+        result = self._empty_result()
+        for batch in self._batched(problems, BATCH_SIZE):
+            self._merge_result(result, self._process_batch(db, Problem, batch, platform, timer))
+        return result
+
+    def _process_batch(self, db, Problem, problems, platform, timer):
+        """Upsert one batch of problems and commit it, timing the parse, diff and commit stages"""
+        started = time.perf_counter()
         new = 0
         updated = 0
+        unchanged = 0
         errors = []
         
-        print(f"\nProcessing {total} problems for {platform}")
-        
+        normalized = []
         for problem in problems:
             try:
+                tag_names = [name.strip() for name in problem.get('tags', []) if name and name.strip()]
+                url = problem.get('url', '')
+                
                 # Get problem data with defaults for missing fields
                 problem_data = {
                     'title': problem.get('title', ''),
+                    'platform': platform,
                     'difficulty': problem.get('difficulty', 'Unknown'),
-                    'url': problem.get('url', ''),
+                    'url': url,
+                    'problem_key': problem.get('problem_key') or make_problem_key(url),
                     'points': problem.get('points', '0'),
-                    'tags': problem.get('tags', [])
+                    'tags': ','.join(tag_names)
                 }
                 
-                print(f"\nProcessing problem: {problem_data['title']}")
-                
-                # Check if problem already exists
-                existing_problem = Problem.query.filter_by(
-                    platform=platform,
-                    title=problem_data['title']
-                ).first()
-                
-                if existing_problem:
-                    print(f"Updating existing problem: {problem_data['title']}")
-                    # Update existing problem
-                    existing_problem.difficulty = problem_data['difficulty']
-                    existing_problem.url = problem_data['url']
-                    existing_problem.points = problem_data['points']
-                    existing_problem.tags = ','.join(problem_data['tags'])
-                    updated += 1
-                else:
-                    print(f"Adding new problem: {problem_data['title']}")
-                    # Create new problem
-                    new_problem = Problem(
-                        title=problem_data['title'],
-                        platform=platform,
-                        difficulty=problem_data['difficulty'],
-                        url=problem_data['url'],
-                        points=problem_data['points'],
-                        tags=','.join(problem_data['tags'])
-                    )
-                    db.session.add(new_problem)
-                    new += 1
-                
+                # Typed columns, derived from difficulty and points unless the
+                # scraper provides them. The '0' points placeholder of scrapers
+                # without solve counts (e.g. LeetCode) leaves solved_count NULL
+                rating = problem.get('rating')
+                solved_count = problem.get('solved_count')
+                if solved_count is None:
+                    solved_count = problem.get('points')
+                problem_data['rating'] = Problem.parse_int(problem_data['difficulty'] if rating is None else rating)
+                problem_data['solved_count'] = Problem.parse_int(solved_count)
+                problem_data['fingerprint'] = Problem.compute_fingerprint(problem_data)
+                normalized.append((problem_data, tag_names))
             except Exception as e:
                 error_msg = f"Error processing problem {problem.get('title', 'Unknown')}: {str(e)}"
-                print(error_msg)
+                logger.warning(error_msg)
                 errors.append(error_msg)
-                continue
+        started = timer.record('parse', started)
         
-        # Commit changes to database
+        # Preload only this batch's existing rows, matched by problem key
+        # first so renamed problems update in place, then by title
+        existing_by_key = {}
+        existing_by_title = {}
+        existing_difficulty = {}
+        enriched_tags = {}
+        for row in self._find_rows(db, Problem, platform, [problem_data for problem_data, _ in normalized]):
+            existing_by_title[row.title] = (row.id, row.title, row.fingerprint)
+            if row.problem_key:
+                existing_by_key[row.problem_key] = (row.id, row.title, row.fingerprint)
+            existing_difficulty[row.id] = row.difficulty
+            if row.enriched and row.tags:
+                enriched_tags[row.id] = row.tags
+        
+        inserts = {}
+        updates = {}
+        insert_tags = {}
+        update_tags = {}
+        renamed = []
+        matched = set()
+        for problem_data, tag_names in normalized:
+            match = existing_by_key.get(problem_data['problem_key']) or existing_by_title.get(problem_data['title'])
+            identity = problem_data['problem_key'] or problem_data['title']
+            if match:
+                problem_id, title, fingerprint = match
+                # Repeated problem in the same payload, last one wins but
+                # the row is only counted once
+                repeated = problem_id in matched
+                matched.add(problem_id)
+                if title == problem_data['title'] and fingerprint == problem_data['fingerprint']:
+                    # Nothing changed, leave the row untouched
+                    unchanged += not repeated
+                    continue
+                
+                # Update existing problem. Tags that enrichment filled in are
+                # kept when the scraper has none, since enrichment skips
+                # problems it has already seen. The fingerprint still
+                # reflects the scraped data
+                if not tag_names and problem_id in enriched_tags:
+                    problem_data['tags'] = enriched_tags[problem_id]
+                    tag_names = problem_data['tags'].split(',')
+                problem_data['id'] = problem_id
+                updates[problem_id] = problem_data
+                update_tags[problem_id] = tag_names
+                if title != problem_data['title'] and problem_id not in renamed:
+                    renamed.append(problem_id)
+                updated += not repeated
+            elif identity in inserts:
+                # Repeated problem in the same payload, last one wins. It is
+                # still a single insert, already counted as new
+                inserts[identity] = problem_data
+                insert_tags[identity] = tag_names
+            else:
+                # Create new problem
+                inserts[identity] = problem_data
+                insert_tags[identity] = tag_names
+                new += 1
+        started = timer.record('diff', started)
+        
+        # Write the batch with executemany and commit it
         try:
-            print(f"\nCommitting changes to database for {platform}")
-            print(f"New problems: {new}")
-            print(f"Updated problems: {updated}")
+            if inserts:
+                db.session.bulk_insert_mappings(Problem, list(inserts.values()))
+            if updates:
+                db.session.bulk_update_mappings(Problem, list(updates.values()))
+            inserted_ids = self._inserted_ids(db, Problem, platform, list(inserts.values()))
+            self._write_tags(inserted_ids, insert_tags, update_tags)
+            index_problem_titles(list(inserted_ids.values()) + renamed)
+            apply_problem_stat_deltas(self._stat_deltas(platform, inserts, updates, existing_difficulty))
             db.session.commit()
-            print("Database commit successful")
+            logger.debug(
+                "Committed %d %s problems: %d new, %d updated, %d unchanged",
+                len(problems), platform, new, updated, unchanged
+            )
         except Exception as e:
             error_msg = f"Database commit error: {str(e)}"
-            print(error_msg)
+            logger.error("%s, changes rolled back", error_msg)
             errors.append(error_msg)
             db.session.rollback()
-            print("Database changes rolled back")
+        timer.record('commit', started)
         
+        for outcome, count in (('new', new), ('updated', updated), ('unchanged', unchanged)):
+            if count:
+                JOB_PROBLEMS.inc('scrape', platform, outcome, amount=count)
         return {
-            'total': total,
+            'total': len(problems),
             'new': new,
             'updated': updated,
+            'unchanged': unchanged,
             'errors': errors
         }
 
+    @staticmethod
+    def _stat_deltas(platform, inserts, updates, existing_difficulty):
+        """Get the problem_stats changes of a batch: (platform, difficulty) -> delta"""
+        deltas = {}
+        for problem_data in inserts.values():
+            key = (platform, problem_data['difficulty'])
+            deltas[key] = deltas.get(key, 0) + 1
+        for problem_id, problem_data in updates.items():
+            old_key = (platform, existing_difficulty[problem_id])
+            new_key = (platform, problem_data['difficulty'])
+            if old_key != new_key:
+                deltas[old_key] = deltas.get(old_key, 0) - 1
+                deltas[new_key] = deltas.get(new_key, 0) + 1
+        return deltas
+
+    @staticmethod
+    def _find_rows(db, Problem, platform, problems):
+        """
+        Get (id, title, problem_key, fingerprint, difficulty, tags, enriched)
+        rows of a platform's problems matching the given problem dicts, by
+        problem key with one IN query, then by title only for problems whose
+        key found nothing. enriched is True for problems with a detail row.
+        """
+        query = db.session.query(
+            Problem.id, Problem.title, Problem.problem_key, Problem.fingerprint, Problem.difficulty,
+            Problem.tags, ProblemDetail.problem_id.isnot(None).label('enriched')
+        ).outerjoin(ProblemDetail, ProblemDetail.problem_id == Problem.id)
+        rows = {}
+        keys = {problem['problem_key'] for problem in problems if problem['problem_key']}
+        if keys:
+            for row in query.filter(Problem.platform == platform, Problem.problem_key.in_(keys)):
+                rows[row.id] = row
+        
+        found = {row.problem_key for row in rows.values()}
+        titles = {problem['title'] for problem in problems if problem['problem_key'] not in found}
+        if titles:
+            for row in query.filter(Problem.platform == platform, Problem.title.in_(titles)):
+                rows[row.id] = row
+        return list(rows.values())
+
+    def _inserted_ids(self, db, Problem, platform, inserts):
+        """Map the identity (problem key or title) of inserted problems to their ids"""
+        if not inserts:
+            return {}
+        
+        # Bulk inserts don't return ids, so look the batch up again
+        identities = {problem_data['problem_key'] or problem_data['title'] for problem_data in inserts}
+        inserted_ids = {}
+        for row in self._find_rows(db, Problem, platform, inserts):
+            identity = row.problem_key or row.title
+            if identity in identities:
+                inserted_ids[identity] = row.id
+        return inserted_ids
+
+    @staticmethod
+    def _write_tags(inserted_ids, insert_tags, update_tags):
+        """Rewrite the tag associations of inserted and updated problems in bulk"""
+        tags_by_problem = dict(update_tags)
+        for identity, problem_id in inserted_ids.items():
+            tags_by_problem[problem_id] = insert_tags[identity]
+        
+        set_problem_tags(tags_by_problem, batch_size=BATCH_SIZE)
+
+    @staticmethod
+    def _batched(items, size):
+        """Group any iterable into lists of at most size items"""
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _chunked(rows, size):
+        """Yield successive slices of at most size rows"""
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    def enrich_problem_details(self, db, Problem, platform=None, limit=None, progress=None):
+        """
+        Fetch statements and tags for problems that have not been enriched yet.
+
+        Pending problems are read in BATCH_SIZE chunks. Each chunk's details
+        are fetched concurrently by up to detail_workers threads, in groups
+        of the scraper's details_batch_size, with per-host throttling left
+        to the shared HTTP client. The chunk is then
+        written and committed from the calling thread. Committing per chunk
+        lets an interrupted run resume where it left off, since enriched
+        problems are skipped next time. Time spent fetching and committing
+        is reported per platform under 'timings'.
+
+        Args:
+            platform (str): Only enrich this platform, defaults to all that
+                support details
+            limit (int): Maximum number of problems to enrich per platform
+            progress: Optional progress(platform, **fields) callback
+
+        Returns:
+            dict: platform -> total/enriched/failed/errors counters
+        """
+        if progress is None:
+            progress = lambda platform, **fields: None
+        
+        if platform:
+            platforms = [platform]
+        else:
+            platforms = [name for name, scraper in self.scrapers.items() if scraper.supports_details]
+        
+        return {
+            name: self._enrich_platform(db, Problem, name, limit, progress)
+            for name in platforms
+        }
+
+    def _enrich_platform(self, db, Problem, platform, limit, progress):
+        """Enrich pending problems of a single platform"""
+        scraper = self.scrapers.get(platform)
+        if scraper is None or not scraper.supports_details:
+            return {
+                'total': 0,
+                'enriched': 0,
+                'failed': 0,
+                'errors': [f"Problem details are not supported for {platform}"]
+            }
+        
+        pending = (
+            db.session.query(Problem.id, Problem.url, Problem.tags)
+            .outerjoin(ProblemDetail, ProblemDetail.problem_id == Problem.id)
+            .filter(Problem.platform == platform, ProblemDetail.problem_id.is_(None), Problem.url != '')
+            .order_by(Problem.id)
+        )
+        total = pending.count()
+        if limit is not None:
+            total = min(total, limit)
+        
+        logger.info("Enriching %d problems for %s", total, platform)
+        progress(platform, status='enriching', fetched=0, upserted=0)
+        
+        timer = StageTimer('enrich', platform)
+        enriched = 0
+        failed = 0
+        errors = []
+        fetched = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=self.detail_workers) as executor:
+            while fetched < total:
+                started = time.perf_counter()
+                batch = pending.filter(Problem.id > last_id).limit(min(BATCH_SIZE, total - fetched)).all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                
+                groups = self._chunked([row.url for row in batch], scraper.details_batch_size)
+                details = [
+                    detail
+                    for group_details in executor.map(scraper.get_problem_details_batch, groups)
+                    for detail in group_details
+                ]
+                fetched += len(batch)
+                started = timer.record('fetch', started)
+                
+                fetched_at = datetime.now()
+                detail_rows = []
+                tags_by_problem = {}
+                for row, detail in zip(batch, details):
+                    if not detail.get('description') and not detail.get('tags'):
+                        # Left pending so the next run retries it
+                        failed += 1
+                        continue
+                    detail_rows.append({
+                        'problem_id': row.id,
+                        'description': detail.get('description', ''),
+                        'acceptance_rate': detail.get('acceptance_rate'),
+                        'likes': detail.get('likes'),
+                        'fetched_at': fetched_at
+                    })
+                    # Only fill in tags the scrape didn't provide
+                    if detail.get('tags') and not row.tags:
+                        tags_by_problem[row.id] = detail['tags']
+                
+                try:
+                    db.session.bulk_insert_mappings(ProblemDetail, detail_rows)
+                    if tags_by_problem:
+                        db.session.bulk_update_mappings(Problem, [
+                            {'id': problem_id, 'tags': ','.join(tags)}
+                            for problem_id, tags in tags_by_problem.items()
+                        ])
+                        set_problem_tags(tags_by_problem, batch_size=BATCH_SIZE)
+                    db.session.commit()
+                    enriched += len(detail_rows)
+                except Exception as e:
+                    error_msg = f"Database commit error: {str(e)}"
+                    logger.error(error_msg)
+                    errors.append(error_msg)
+                    db.session.rollback()
+                    break
+                finally:
+                    timer.record('commit', started)
+                
+                progress(platform, fetched=fetched, upserted=enriched)
+                logger.debug("Enriched %d/%d problems for %s", enriched, total, platform)
+        
+        progress(platform, status='error' if errors else 'done')
+        JOB_PROBLEMS.inc('enrich', platform, 'enriched', amount=enriched)
+        JOB_PROBLEMS.inc('enrich', platform, 'failed', amount=failed)
+        logger.info(
+            "Enriched %d/%d problems for %s, %d failed", enriched, total, platform, failed,
+            extra={f'{stage}_seconds': seconds for stage, seconds in timer.totals().items()}
+        )
+        return {
+            'total': total,
+            'enriched': enriched,
+            'failed': failed,
+            'errors': errors,
+            'timings': timer.totals()
+        }
+
+    def link_duplicates(self, db, Problem, progress=None):
+        """
+        Link problems on different platforms whose titles are near-duplicates.
+
+        Each title is stripped of decorations by its platform's scraper, e.g.
+        the "4A - " prefix of Codeforces, before find_duplicates compares
+        them. The stored links are then rewritten in one transaction, only
+        for problems whose links changed.
+
+        Args:
+            progress: Optional progress(platform, **fields) callback
+
+        Returns:
+            dict: platform -> total/linked/updated counters, where linked
+            counts problems with a duplicate and updated those whose links
+            changed
+        """
+        if progress is None:
+            progress = lambda platform, **fields: None
+        
+        platforms = {}
+        problems = []
+        for problem_id, platform, title in db.session.query(Problem.id, Problem.platform, Problem.title):
+            scraper = self.scrapers.get(platform)
+            problems.append((problem_id, platform, scraper.base_title(title) if scraper else title))
+            platforms[problem_id] = platform
+        
+        links = find_duplicates(problems)
+        try:
+            changed = replace_problem_links(links, batch_size=BATCH_SIZE)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        linked = {problem_id for pair in links for problem_id in pair}
+        results = {}
+        for problem_id, platform in platforms.items():
+            result = results.setdefault(platform, {'total': 0, 'linked': 0, 'updated': 0})
+            result['total'] += 1
+            result['linked'] += problem_id in linked
+            result['updated'] += problem_id in changed
+        for platform, result in results.items():
+            progress(platform, status='completed', linked=result['linked'])
+        logger.info("Linked %d near-duplicate problem pairs across platforms", len(links))
+        return results
+
     def get_problems_by_platform(self, db, Problem, platform):
         """Get all problems from a specific platform"""
         return Problem.query.filter_by(platform=platform).all()
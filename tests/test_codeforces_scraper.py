@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+import io
+import json
+import os
+import time
+import pytest
+from scrapers import codeforces_scraper
+from scrapers.codeforces_scraper import CodeforcesScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def synthetic_payload(size):
+    """problemset.problems response with size problems and their statistics, in reverse order"""
+    problems = []
+    statistics = []
+    for i in range(size):
+        contest_id, index = 1 + i // 5, 'ABCDE'[i % 5]
+        problem = {'contestId': contest_id, 'index': index, 'name': f'Problem {i}', 'tags': ['math', 'dp'][:i % 3]}
+        if i % 4:
+            problem['rating'] = 800 + 100 * (i % 28)
+        problems.append(problem)
+        statistics.append({'contestId': contest_id, 'index': index, 'solvedCount': i * 7})
+    statistics.reverse()
+    return json.dumps({'status': 'OK', 'result': {'problems': problems, 'problemStatistics': statistics}})
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setenv('HTTP_CACHE_ENABLED', '0')
+    return CodeforcesScraper()
+
+def serve(monkeypatch, scraper, payload):
+    @contextmanager
+    def open_stream(url):
+        yield io.StringIO(payload)
+    monkeypatch.setattr(scraper, '_open_stream', open_stream)
+
+def parse_seconds(monkeypatch, scraper, size):
+    serve(monkeypatch, scraper, synthetic_payload(size))
+    started = time.perf_counter()
+    count = sum(1 for _ in scraper.iter_problems())
+    assert count == size
+    return time.perf_counter() - started
+
+def test_problems_are_joined_with_their_statistics(monkeypatch, scraper):
+    serve(monkeypatch, scraper, synthetic_payload(12))
+    problems = list(scraper.iter_problems())
+
+    assert len(problems) == 12
+    assert problems[6] == {
+        'title': '2B - Problem 6',
+        'platform': 'codeforces',
+        'difficulty': '1400',
+        'url': 'https://codeforces.com/problemset/problem/2/B',
+        'problem_key': 'codeforces:2/B',
+        'points': '42',
+        'rating': 1400,
+        'solved_count': 42,
+        'tags': []
+    }
+    assert problems[4]['difficulty'] == 'Unknown' and problems[4]['rating'] is None
+
+def test_failed_status_yields_nothing(monkeypatch, scraper):
+    serve(monkeypatch, scraper, json.dumps({'status': 'FAILED', 'comment': 'Call limit exceeded'}))
+    assert list(scraper.iter_problems()) == []
+
+def test_parse_is_linear_in_payload_size(monkeypatch, scraper):
+    """
+    Microbenchmark on a synthetic 50k-problem payload. Joining statistics
+    by scanning them per problem made this quadratic, 25x slower than 10k
+    problems instead of 5x.
+    """
+    small = min(parse_seconds(monkeypatch, scraper, 10_000) for _ in range(2))
+    large = parse_seconds(monkeypatch, scraper, 50_000)
+    assert large < small * 12, f"10k problems: {small:.3f}s, 50k problems: {large:.3f}s"
+
+def details_seconds(scraper, url, rounds):
+    """Best time to get a problem's details, and the details"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        details = scraper.get_problem_details(url)
+        best = min(best, time.perf_counter() - started)
+    return best, details
+
+def test_strained_problem_page_matches_full_parse(monkeypatch, scraper):
+    """
+    The SoupStrainer builds only the statement and tag boxes of a saved
+    problem page. It must find the same details as the whole tree, in
+    less time.
+    """
+    with open(os.path.join(FIXTURES, 'codeforces_problem_page.html'), encoding='utf-8') as f:
+        html = f.read()
+    monkeypatch.setattr(scraper, '_make_request', lambda url: html)
+    url = 'https://codeforces.com/problemset/problem/4/A'
+
+    strained, details = details_seconds(scraper, url, 20)
+    monkeypatch.setattr(codeforces_scraper, 'PROBLEM_PAGE_STRAINER', None)
+    full, full_details = details_seconds(scraper, url, 20)
+
+    assert details == full_details
+    assert details['description'].startswith('One hot summer day Pete and his friend Billy')
+    assert details['tags'] == ['brute force', 'math']
+    assert strained < full, f"strained: {strained * 1000:.2f}ms, full tree: {full * 1000:.2f}ms"
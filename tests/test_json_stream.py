@@ -0,0 +1,48 @@
+import json
+import pytest
+from scrapers.json_stream import iter_json_path
+
+DOCUMENTS = [
+    ('{"a":1.5e3}', ('a',)),
+    ('{"a": [1, -2, 3.25, -0.5e-3, 1E+2, 0, 12345678901234567890]}', ('a',)),
+    ('{"skip": {"x": [1, {"y": []}, {}], "z": "q"}, "a": [true, false, null, 7]}', ('a',)),
+    ('{"a": ["esc\\"aped", "back\\\\slash", "uni\\u00e9\\ud83d\\ude00", "new\\nline", "} ] ,"]}', ('a',)),
+    ('{"a": []}', ('a',)),
+    ('{"a": {}}', ('a',)),
+    ('{"s": 1.25, "b": [[], {}, [[]]], "result": {"other": [1e5, 2.5], "problems": [{"id": 1, "r": 1.5e2}, {"id": 2, "tags": []}]}}',
+     ('result', 'problems')),
+    ('{"status": "OK", "result": {}}', ('status',)),
+    ('{"n": -12.5E-2}', ('n',)),
+    (' \n{ "a" : [ 1 , 2.0 ,\t3e1 ] } \n', ('a',)),
+    ('{"a": 1}', ('missing',)),
+]
+
+def expected(document, path):
+    value = json.loads(document)
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return []
+        value = value[key]
+    return value if isinstance(value, list) else [value]
+
+def split(document, size):
+    return [document[start:start + size] for start in range(0, len(document), size)]
+
+@pytest.mark.parametrize('document,path', DOCUMENTS)
+def test_every_chunk_size_matches_json_loads(document, path):
+    want = expected(document, path)
+    for size in range(1, len(document) + 1):
+        assert list(iter_json_path(split(document, size), path)) == want, f"chunk size {size}"
+
+def test_number_at_end_of_stream_is_complete():
+    assert list(iter_json_path(['{"a":', '1.', '5'], ('a',))) == [1.5]
+    assert list(iter_json_path(['[1.', '5]'], ())) == [1.5]
+
+def test_stops_reading_after_the_value():
+    chunks = iter(['{"a": [1, 2]', ', "b": '])
+    assert list(iter_json_path(chunks, ('a',))) == [1, 2]
+    assert next(chunks) == ', "b": '
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_path(split('{"a": [1, 2', 3), ('a',)))
@@ -0,0 +1,114 @@
+import json
+import os
+import queue
+import threading
+import pytest
+from scrapers.leetcode_scraper import QUESTION_LIST_PAGE_SIZE, LeetCodeScraper
+from services.scraper_service import ScraperService
+from utils.metrics import StageTimer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, f'{name}.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setenv('HTTP_CACHE_ENABLED', '0')
+    return LeetCodeScraper()
+
+def stub_graphql(monkeypatch, scraper, responses):
+    """Answer _graphql calls with recorded responses in order, recording the variables"""
+    calls = []
+    responses = iter(responses)
+
+    def graphql(query, variables=None):
+        calls.append(variables)
+        return next(responses).get('data')
+    monkeypatch.setattr(scraper, '_graphql', graphql)
+    return calls
+
+def test_parse_question_list_skips_paid_questions(scraper):
+    page = load_fixture('leetcode_question_list_page1')['data']['problemsetQuestionList']
+    assert scraper._parse_question_list(page) == [{
+        'title': 'Two Sum',
+        'platform': 'leetcode',
+        'difficulty': 'Easy',
+        'url': 'https://leetcode.com/problems/two-sum/',
+        'problem_key': 'leetcode:two-sum',
+        'tags': ['Array', 'Hash Table']
+    }]
+
+def test_parse_metadata_reads_aliased_questions(scraper):
+    metadata = scraper._parse_metadata(load_fixture('leetcode_question_metadata')['data'])
+    assert set(metadata) == {'two-sum', 'median-of-two-sorted-arrays'}
+
+    two_sum = metadata['two-sum']
+    assert two_sum['description'].startswith('Given an array of integers nums')
+    assert two_sum['tags'] == ['Array', 'Hash Table']
+    assert two_sum['acceptance_rate'] == 53.2
+    assert two_sum['likes'] == 56321
+    assert metadata['median-of-two-sorted-arrays']['acceptance_rate'] == 40.8
+
+@pytest.mark.parametrize('stats,expected', [
+    ('{"acRate": "53.2%"}', 53.2),
+    ('{"acRate": "100%"}', 100.0),
+    ('{"totalAccepted": "1M"}', None),
+    ('{"acRate": "n/a"}', None),
+    ('not json', None),
+    (None, None),
+])
+def test_parse_acceptance_rate(scraper, stats, expected):
+    assert scraper._parse_acceptance_rate(stats) == expected
+
+def test_pagination_stops_once_total_is_reached(monkeypatch, scraper):
+    calls = stub_graphql(monkeypatch, scraper, [
+        load_fixture('leetcode_question_list_page1'),
+        load_fixture('leetcode_question_list_page2'),
+    ])
+    problems = list(scraper.iter_problems())
+
+    assert [problem['title'] for problem in problems] == ['Two Sum', 'Median of Two Sorted Arrays']
+    assert [call['skip'] for call in calls] == [0, 2]
+    assert all(call['limit'] == QUESTION_LIST_PAGE_SIZE for call in calls)
+
+def test_pagination_stops_at_an_empty_page(monkeypatch, scraper):
+    empty = {'data': {'problemsetQuestionList': {'total': 10, 'questions': []}}}
+    calls = stub_graphql(monkeypatch, scraper, [load_fixture('leetcode_question_list_page1'), empty])
+    pages = list(scraper._iter_graphql_pages())
+
+    assert len(pages) == 1
+    assert len(calls) == 2
+
+def test_null_question_list_falls_back_to_rest(monkeypatch, scraper):
+    stub_graphql(monkeypatch, scraper, [load_fixture('leetcode_question_list_error')])
+    rest_problem = {'title': 'Two Sum', 'platform': 'leetcode'}
+    monkeypatch.setattr(scraper, '_iter_problems_from_rest', lambda: iter([rest_problem]))
+
+    assert list(scraper.iter_problems()) == [rest_problem]
+
+def test_failed_later_page_raises(monkeypatch, scraper):
+    stub_graphql(monkeypatch, scraper, [
+        load_fixture('leetcode_question_list_page1'),
+        load_fixture('leetcode_question_list_error'),
+    ])
+    monkeypatch.setattr(scraper, '_iter_problems_from_rest', lambda: pytest.fail('fell back to REST'))
+    problems = scraper.iter_problems()
+
+    assert next(problems)['title'] == 'Two Sum'
+    with pytest.raises(RuntimeError, match='offset 2 of 3'):
+        next(problems)
+
+def test_failed_later_page_is_a_platform_error(monkeypatch, scraper):
+    stub_graphql(monkeypatch, scraper, [
+        load_fixture('leetcode_question_list_page1'),
+        load_fixture('leetcode_question_list_error'),
+    ])
+    messages = queue.Queue()
+    service = ScraperService(scrapers={'leetcode': scraper})
+    service._fetch_batches('leetcode', scraper, messages, threading.Event(), StageTimer('scrape', 'leetcode'))
+
+    platform, kind, payload = messages.get_nowait()
+    assert (platform, kind) == ('leetcode', 'error')
+    assert 'offset 2 of 3' in payload
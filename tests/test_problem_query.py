@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+from services.problem_query import EXPORT_BATCH_SIZE, _csv_chunks, _ndjson_chunks
+
+FIELDS = ('id', 'title', 'tags')
+
+def rows(count):
+    for i in range(count):
+        yield SimpleNamespace(id=i, title=f'Problem {i}', tags='Array,Math' if i % 2 else None)
+
+def test_ndjson_yields_the_first_row_before_reading_a_batch():
+    source = rows(EXPORT_BATCH_SIZE + 5)
+    chunks = _ndjson_chunks(source, FIELDS)
+
+    assert next(chunks) == '{"id": 0, "title": "Problem 0", "tags": []}\n'
+    # Only the first row has been read so far
+    assert next(source).id == 1
+
+def test_ndjson_batches_the_remaining_rows():
+    chunks = list(_ndjson_chunks(rows(EXPORT_BATCH_SIZE + 5), FIELDS))
+
+    assert [chunk.count('\n') for chunk in chunks] == [1, EXPORT_BATCH_SIZE, 4]
+    assert chunks[1].startswith('{"id": 1, "title": "Problem 1", "tags": ["Array", "Math"]}\n')
+
+def test_ndjson_without_rows_yields_an_empty_chunk():
+    assert list(_ndjson_chunks(rows(0), FIELDS)) == ['']
+
+def test_csv_yields_the_header_first():
+    chunks = list(_csv_chunks(rows(3), FIELDS))
+
+    assert chunks == ['id,title,tags\r\n', '0,Problem 0,\r\n1,Problem 1,"Array,Math"\r\n2,Problem 2,\r\n']
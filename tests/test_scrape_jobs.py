@@ -0,0 +1,53 @@
+import threading
+from types import SimpleNamespace
+from flask import Flask
+from services.scrape_jobs import ScrapeJobRunner
+
+class StubService:
+    def scrape_all_platforms(self, db, Problem, progress=None):
+        return {'codeforces': {'new': 1}}
+
+def make_runner(on_complete):
+    db = SimpleNamespace(session=SimpleNamespace(remove=lambda: None))
+    return ScrapeJobRunner(Flask(__name__), StubService(), db, None, on_complete=on_complete)
+
+def wait_for(job):
+    for _ in range(200):
+        if job.is_finished:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job still {job.status}")
+
+def test_hook_runs_before_the_job_completes():
+    seen = []
+
+    def hook(results):
+        # Triggering while the hook runs joins the job instead of starting another
+        joined, created = runner.submit('scrape')
+        seen.append((joined, created, joined.status))
+    runner = make_runner(hook)
+    job, created = runner.submit('scrape')
+    wait_for(job)
+
+    assert created
+    assert seen == [(job, False, 'running')]
+    assert job.status == 'completed'
+
+def test_new_job_starts_once_the_previous_one_completed():
+    runner = make_runner(None)
+    job, _ = runner.submit('scrape')
+    wait_for(job)
+
+    next_job, created = runner.submit('scrape')
+    assert created and next_job is not job
+    wait_for(next_job)
+
+def test_failing_hook_does_not_fail_the_job():
+    def hook(results):
+        raise RuntimeError("warming failed")
+    runner = make_runner(hook)
+    job, _ = runner.submit('scrape')
+    wait_for(job)
+
+    assert job.status == 'completed'
+    assert job.results == {'codeforces': {'new': 1}}
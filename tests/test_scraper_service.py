@@ -0,0 +1,137 @@
+from datetime import datetime
+from flask import Flask
+import pytest
+from sqlalchemy import text
+from models import Problem, ProblemDetail, ProblemStat, Tag, db, problem_tags, set_problem_tags, upgrade_schema
+from services.scraper_service import ScraperService
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        upgrade_schema(db)
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def service():
+    return ScraperService(scrapers={})
+
+def problem(slug, title=None, difficulty='Easy', tags=(), **fields):
+    return {
+        'title': title or slug.replace('-', ' ').title(),
+        'url': f'https://leetcode.com/problems/{slug}/',
+        'difficulty': difficulty,
+        'tags': list(tags),
+        **fields
+    }
+
+def counts(result):
+    return {name: result[name] for name in ('total', 'new', 'updated', 'unchanged')}
+
+def stored_tags(problem_id):
+    return sorted(
+        name for name, in db.session.query(Tag.name)
+        .join(problem_tags, problem_tags.c.tag_id == Tag.id)
+        .filter(problem_tags.c.problem_id == problem_id)
+    )
+
+def stats():
+    return {
+        (row.platform, row.difficulty): row.count
+        for row in ProblemStat.query.all() if row.count
+    }
+
+def row(slug):
+    return Problem.query.filter_by(problem_key=f'leetcode:{slug}').one()
+
+def test_new_updated_and_unchanged_are_classified(app, service):
+    result = service._process_problems(db, Problem, [problem('two-sum', tags=['Array']), problem('add-two-numbers')], 'leetcode')
+    assert counts(result) == {'total': 2, 'new': 2, 'updated': 0, 'unchanged': 0}
+
+    result = service._process_problems(db, Problem, [
+        problem('two-sum', tags=['Array']),
+        problem('add-two-numbers', difficulty='Medium'),
+        problem('3sum'),
+    ], 'leetcode')
+    assert counts(result) == {'total': 3, 'new': 1, 'updated': 1, 'unchanged': 1}
+    assert row('add-two-numbers').difficulty == 'Medium'
+    assert not result['errors']
+
+def test_repeated_problems_are_counted_once(app, service):
+    result = service._process_problems(db, Problem, [problem('two-sum'), problem('two-sum', difficulty='Hard')], 'leetcode')
+    assert counts(result) == {'total': 2, 'new': 1, 'updated': 0, 'unchanged': 0}
+    assert row('two-sum').difficulty == 'Hard'
+
+    result = service._process_problems(db, Problem, [
+        problem('two-sum', difficulty='Easy'), problem('two-sum', difficulty='Medium')
+    ], 'leetcode')
+    assert counts(result) == {'total': 2, 'new': 0, 'updated': 1, 'unchanged': 0}
+    assert row('two-sum').difficulty == 'Medium'
+    assert Problem.query.count() == 1
+
+def test_renamed_problem_is_updated_in_place_by_key(app, service):
+    service._process_problems(db, Problem, [problem('two-sum', title='Two Sum')], 'leetcode')
+    problem_id = row('two-sum').id
+
+    result = service._process_problems(db, Problem, [problem('two-sum', title='Two Sum (Easy)')], 'leetcode')
+    assert counts(result)['updated'] == 1
+    assert Problem.query.count() == 1
+    assert db.session.get(Problem, problem_id).title == 'Two Sum (Easy)'
+    # The search index follows the rename
+    assert db.session.execute(text(
+        "SELECT rowid FROM problem_title_search WHERE title MATCH '\"easy\"'"
+    )).scalars().all() == [problem_id]
+
+def test_stats_follow_inserts_and_difficulty_changes(app, service):
+    service._process_problems(db, Problem, [problem('two-sum'), problem('3sum', difficulty='Medium')], 'leetcode')
+    assert stats() == {('leetcode', 'Easy'): 1, ('leetcode', 'Medium'): 1}
+
+    service._process_problems(db, Problem, [problem('two-sum', difficulty='Medium')], 'leetcode')
+    assert stats() == {('leetcode', 'Medium'): 2}
+
+def test_stat_deltas_move_counts_between_difficulties(service):
+    inserts = {'a': {'difficulty': 'Easy'}, 'b': {'difficulty': 'Easy'}}
+    updates = {1: {'difficulty': 'Hard'}, 2: {'difficulty': 'Easy'}}
+    deltas = service._stat_deltas('leetcode', inserts, updates, {1: 'Easy', 2: 'Easy'})
+    assert deltas == {('leetcode', 'Easy'): 1, ('leetcode', 'Hard'): 1}
+
+def test_tags_are_rewritten_with_the_row(app, service):
+    service._process_problems(db, Problem, [problem('two-sum', tags=['Array', 'Hash Table'])], 'leetcode')
+    problem_id = row('two-sum').id
+    assert stored_tags(problem_id) == ['Array', 'Hash Table']
+
+    service._process_problems(db, Problem, [problem('two-sum', tags=['Array', 'Two Pointers'])], 'leetcode')
+    assert stored_tags(problem_id) == ['Array', 'Two Pointers']
+    assert row('two-sum').tags == 'Array,Two Pointers'
+
+def test_find_rows_matches_by_key_then_title(app, service):
+    service._process_problems(db, Problem, [problem('two-sum'), {'title': 'Keyless', 'url': ''}], 'leetcode')
+    rows = service._find_rows(db, Problem, 'leetcode', [
+        {'problem_key': 'leetcode:two-sum', 'title': 'Renamed'},
+        {'problem_key': None, 'title': 'Keyless'},
+        {'problem_key': 'leetcode:missing', 'title': 'Missing'},
+    ])
+    assert sorted(found.title for found in rows) == ['Keyless', 'Two Sum']
+    assert service._find_rows(db, Problem, 'codeforces', [{'problem_key': 'leetcode:two-sum', 'title': 'Two Sum'}]) == []
+
+def test_enriched_tags_survive_a_tagless_scrape(app, service):
+    service._process_problems(db, Problem, [problem('two-sum')], 'leetcode')
+    problem_id = row('two-sum').id
+    # What enrichment writes for a problem the scrape had no tags for
+    db.session.add(ProblemDetail(problem_id=problem_id, description='...', fetched_at=datetime.now()))
+    db.session.query(Problem).filter_by(id=problem_id).update({'tags': 'Array'})
+    set_problem_tags({problem_id: ['Array']})
+    db.session.commit()
+
+    result = service._process_problems(db, Problem, [problem('two-sum', difficulty='Medium')], 'leetcode')
+    assert counts(result)['updated'] == 1
+    assert row('two-sum').tags == 'Array'
+    assert stored_tags(problem_id) == ['Array']
+
+    # Unchanged scraped data still compares equal afterwards
+    result = service._process_problems(db, Problem, [problem('two-sum', difficulty='Medium')], 'leetcode')
+    assert counts(result)['unchanged'] == 1
@@ -0,0 +1,84 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Attributes every LogRecord has, anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+
+def record_fields(record):
+    """Get the structured fields a record was logged with through extra={...}"""
+    return {
+        name: value for name, value in vars(record).items()
+        if name not in _RECORD_ATTRIBUTES and not name.startswith('_')
+    }
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines with structured fields appended as key=value"""
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        line = super().format(record)
+        fields = record_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{name}={value}' for name, value in fields.items())
+        return line
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with structured fields as top-level keys"""
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(record_fields(record))
+        return json.dumps(entry, default=str)
+
+def configure_logging(level=None, log_file=None, log_format=None):
+    """
+    Route all logging through a background thread to stdout and optionally
+    a file.
+
+    Loggers only put records on an in-memory queue, so request and scrape
+    threads never wait on the terminal or the disk. Records below the level
+    are dropped before they are formatted, so debug logging in hot loops
+    costs a level check when it is off. Calling this again does nothing.
+
+    Args:
+        level (str): Level name, defaults to LOG_LEVEL or INFO
+        log_file (str): File to also write to, defaults to LOG_FILE
+        log_format (str): 'text' or 'json', defaults to LOG_FORMAT or text
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    level = (level or os.getenv('LOG_LEVEL') or 'INFO').upper()
+    log_file = log_file if log_file is not None else os.getenv('LOG_FILE')
+    log_format = (log_format or os.getenv('LOG_FORMAT') or 'text').lower()
+
+    formatter = JSONFormatter() if log_format == 'json' else TextFormatter()
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(level if isinstance(logging.getLevelName(level), int) else logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(records))
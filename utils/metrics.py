@@ -0,0 +1,162 @@
+from bisect import bisect_left
+import threading
+import time
+
+# Upper bounds (seconds) of the request latency buckets
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Upper bounds (seconds) of the job stage buckets, which time whole batches
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter per combination of label values"""
+    type = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        """Yield (name, labels, value) in the exposition format"""
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+class Histogram:
+    """
+    Cumulative histogram per combination of label values.
+
+    Observing finds the bucket by bisection and bumps one count, the
+    cumulative counts Prometheus expects are only summed when rendering.
+    """
+    type = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=REQUEST_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts with a trailing +Inf bucket, sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        """Yield (name, labels, value) in the exposition format"""
+        with self._lock:
+            series = sorted((label_values, list(counts), total) for label_values, (counts, total) in self._series.items())
+        for label_values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', _format_labels(self.labels, label_values, [('le', bound)]), cumulative
+            labels = _format_labels(self.labels, label_values)
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+class MetricsRegistry:
+    """Metrics of this process, rendered in the Prometheus text format"""
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, description, labels=()):
+        return self._register(Counter(name, description, labels))
+
+    def histogram(self, name, description, labels=(), buckets=REQUEST_BUCKETS):
+        return self._register(Histogram(name, description, labels, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        """Get every metric in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', 'Time spent handling HTTP requests',
+    labels=('method', 'endpoint', 'status')
+)
+
+JOB_STAGE_SECONDS = registry.histogram(
+    'job_stage_duration_seconds', 'Time spent in each stage of background job batches',
+    labels=('job', 'platform', 'stage'), buckets=STAGE_BUCKETS
+)
+
+JOB_PROBLEMS = registry.counter(
+    'job_problems_total', 'Problems processed by background jobs, by outcome',
+    labels=('job', 'platform', 'outcome')
+)
+
+class StageTimer:
+    """
+    Times the stages of a background job for one platform.
+
+    Each measurement is observed in JOB_STAGE_SECONDS and added to a running
+    total per stage, which the job reports with its results. Stages may be
+    recorded from several threads.
+    """
+    def __init__(self, job, platform):
+        self.job = job
+        self.platform = platform
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, started):
+        """
+        Record the time since started (a time.perf_counter() reading) against
+        a stage.
+
+        Returns:
+            float: The current time.perf_counter(), to time the next stage from
+        """
+        now = time.perf_counter()
+        JOB_STAGE_SECONDS.observe(now - started, self.job, self.platform, stage)
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0) + now - started
+        return now
+
+    def totals(self):
+        """Get seconds spent per stage so far, rounded to milliseconds"""
+        with self._lock:
+            return {stage: round(seconds, 3) for stage, seconds in self._totals.items()}
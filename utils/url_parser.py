@@ -1,6 +1,9 @@
+import logging
 import re
 from urllib.parse import urlparse
 
+logger = logging.getLogger(__name__)
+
 def extract_problem_identifier(url):
     """
     Extract problem identifier from platform-specific URLs.
@@ -16,33 +19,46 @@ def extract_problem_identifier(url):
         url = url.strip().rstrip('/')
         parsed_url = urlparse(url)
         
-        # Debug print
-        print(f"Parsing URL: {url}")
-        print(f"Netloc: {parsed_url.netloc}")
-        print(f"Path: {parsed_url.path}")
-        
         # LeetCode URL pattern: https://leetcode.com/problems/two-sum/
         if 'leetcode.com' in parsed_url.netloc:
             if '/problems/' in parsed_url.path:
                 # Extract everything after /problems/
                 parts = parsed_url.path.split('/problems/')
                 if len(parts) > 1:
-                    slug = parts[1].split('/')[0]  # Get the first part after /problems/
-                    print(f"Extracted LeetCode slug: {slug}")
-                    return 'leetcode', slug
+                    slug = parts[1].split('/')[0].lower()  # Get the first part after /problems/
+                    if slug:
+                        return 'leetcode', slug
         
         # Codeforces URL pattern: https://codeforces.com/problemset/problem/4/A
         elif 'codeforces.com' in parsed_url.netloc:
             if '/problemset/problem/' in parsed_url.path:
                 parts = parsed_url.path.split('/problemset/problem/')[1].split('/')
-                if len(parts) >= 2:
+                if len(parts) >= 2 and parts[0] and parts[1]:
                     # Format: number/letter (e.g., 4/A)
-                    identifier = f"{parts[0]}/{parts[1]}"
-                    print(f"Extracted Codeforces identifier: {identifier}")
+                    identifier = f"{parts[0]}/{parts[1].upper()}"
                     return 'codeforces', identifier
         
-        print("URL format not recognized")
         return None, None
     except Exception as e:
-        print(f"Error parsing URL: {e}")
-        return None, None 
\ No newline at end of file
+        logger.debug("Error parsing URL %r: %s", url, e)
+        return None, None 
+
+def make_problem_key(url):
+    """
+    Build the canonical key of a problem from its URL.
+    
+    Args:
+        url (str): The problem URL
+        
+    Returns:
+        str: Key such as 'leetcode:two-sum' or 'codeforces:4/A', or None if
+        the URL is not recognized
+    """
+    platform, identifier = extract_problem_identifier(url)
+    if not platform or not identifier:
+        return None
+    return format_problem_key(platform, identifier)
+
+def format_problem_key(platform, identifier):
+    """Join a platform and problem identifier into a canonical problem key"""
+    return f"{platform}:{identifier}"